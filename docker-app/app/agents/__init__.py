@@ -4,18 +4,26 @@ Multi-Agent System for AWS Data Engineer Course
 This module exports the main coordinator agent and all specialist agents.
 """
 
+import threading
+from typing import Dict
+
+from app.config import BEDROCK_MODEL_ID, AGENT_PREWARM
 from .coordinator import CoordinatorAgent
 from .ingestion_agent import DataIngestionAgent
 from .storage_agent import StorageAgent
 from .security_agent import SecurityAgent
 from .operations_agent import OperationsAgent
 
-# Export the main coordinator for easy access
-coordinator = None
+# Coordinators shared by all sessions in the process, keyed by model ID
+_coordinators: Dict[str, CoordinatorAgent] = {}
+_coordinators_lock = threading.Lock()
 
-def get_coordinator(model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0") -> CoordinatorAgent:
+def get_coordinator(model_id: str = BEDROCK_MODEL_ID) -> CoordinatorAgent:
     """
-    Get or create the main coordinator agent.
+    Get or create the shared coordinator agent for a model.
+    
+    The coordinator and its specialists are built once per model and reused
+    by every session; per-session conversation state stays with the caller.
     
     Args:
         model_id: The Claude model ID to use
@@ -23,9 +31,14 @@ def get_coordinator(model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0") -
     Returns:
         CoordinatorAgent instance
     """
-    global coordinator
+    coordinator = _coordinators.get(model_id)
     if coordinator is None:
-        coordinator = CoordinatorAgent(model_id)
+        with _coordinators_lock:
+            coordinator = _coordinators.get(model_id)
+            if coordinator is None:
+                coordinator = _coordinators[model_id] = CoordinatorAgent(model_id)
+                if AGENT_PREWARM:
+                    coordinator.prewarm()
     return coordinator
 
 # Export all agent classes
@@ -6,8 +6,12 @@ and synthesizes their responses into coherent answers for the user.
 """
 
 import re
-from typing import Dict, List, Tuple, Any
-from strands import Agent
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Tuple, Any, Optional
+from .pool import AgentPool
+from app.config import AGENT_TIMEOUT_SECONDS, AGENT_MAX_WORKERS, SYNTHESIS_OVERLAP_THRESHOLD
 from app.tools import (
     get_progress_tool,
     update_progress_tool,
@@ -20,25 +24,52 @@ from .ingestion_agent import DataIngestionAgent
 from .storage_agent import StorageAgent
 from .security_agent import SecurityAgent
 from .operations_agent import OperationsAgent
+from .routing import KeywordMatcher
+from .streaming import stream_agent
+from .overlap import max_overlap
+from app.utils.bedrock_client import get_bedrock_client, get_bedrock_model
+from app.utils.rate_limiter import SingleFlight, request_key
+from app.utils.response_cache import get_response_cache, normalize_question
+
+# Shared pool for specialist fan-out; agents run concurrently instead of back to back
+_specialist_executor = ThreadPoolExecutor(max_workers=AGENT_MAX_WORKERS, thread_name_prefix="specialist")
+
+# Prefix of the message agents return instead of raising
+ERROR_PREFIX = "Error processing question:"
 
 
 class CoordinatorAgent:
     """Main coordinator agent that routes questions and synthesizes responses."""
     
+    # Specialist display names and classes by routing domain, in routing order
+    SPECIALISTS = {
+        'ingestion': ('Data Ingestion', DataIngestionAgent),
+        'storage': ('Storage', StorageAgent),
+        'security': ('Security', SecurityAgent),
+        'operations': ('Operations', OperationsAgent)
+    }
+    
     def __init__(self, model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"):
         """
-        Initialize the Coordinator Agent and all specialist agents.
+        Initialize the Coordinator Agent.
+        
+        Specialist agents are created on first use, since most questions need
+        only one of them and course questions need none.
         
         Args:
             model_id: The Claude model ID to use
         """
         self.model_id = model_id
         
-        # Initialize specialist agents
-        self.ingestion_agent = DataIngestionAgent(model_id)
-        self.storage_agent = StorageAgent(model_id)
-        self.security_agent = SecurityAgent(model_id)
-        self.operations_agent = OperationsAgent(model_id)
+        # Cache for specialist answers (None when RESPONSE_CACHE is "off")
+        self.response_cache = get_response_cache()
+        
+        # Concurrent identical questions share one round of specialist calls
+        self._single_flight = SingleFlight()
+        
+        # Specialist agents by domain, created on first use
+        self._specialists: Dict[str, Any] = {}
+        self._specialists_lock = threading.Lock()
         
         # Coordinator system prompt
         self.system_prompt = """You are the main coordinator for an AWS Data Engineer certification course assistant.
@@ -68,8 +99,8 @@ When routing questions:
 3. Synthesize responses if multiple agents are involved
 4. Always provide actionable, practical guidance"""
 
-        self.coordinator = Agent(
-            model=f"bedrock:{model_id}",
+        self.coordinator = AgentPool(
+            model=get_bedrock_model(model_id),
             tools=[
                 get_progress_tool,
                 update_progress_tool,
@@ -100,29 +131,53 @@ When routing questions:
                 'orchestration', 'alerting', 'performance', 'operations', 'eventbridge'
             ]
         }
+        
+        # Course/progress questions are answered by the coordinator itself
+        self.course_keywords = ['progress', 'recommendation', 'next', 'complete', 'stats', 'course']
+        
+        # General AWS data engineering terms used when no domain matches
+        self.general_keywords = ['aws', 'data', 'pipeline', 'architecture']
+        
+        # Compile the whole routing vocabulary once so each question is scanned in a single pass
+        self.keyword_matcher = KeywordMatcher({
+            **self.routing_keywords,
+            'course': self.course_keywords,
+            'general': self.general_keywords
+        })
     
-    def analyze_question(self, question: str) -> List[str]:
+    def match_keywords(self, question: str) -> Counter:
+        """
+        Match the routing vocabulary against a question in a single pass.
+        
+        Args:
+            question: The user's question
+            
+        Returns:
+            Counter of keyword hits per label (domain names, 'course' and 'general')
+        """
+        return self.keyword_matcher.match(question)
+    
+    def analyze_question(self, question: str, hits: Optional[Counter] = None) -> List[str]:
         """
         Analyze a question to determine which specialist agent(s) should handle it.
         
         Args:
             question: The user's question
+            hits: Keyword hits from match_keywords, if already computed
             
         Returns:
             List of agent types that should handle the question
         """
-        question_lower = question.lower()
-        relevant_agents = []
+        if hits is None:
+            hits = self.match_keywords(question)
         
-        # Check for keywords in each domain
-        for domain, keywords in self.routing_keywords.items():
-            if any(keyword in question_lower for keyword in keywords):
-                relevant_agents.append(domain)
+        # Every domain with at least one whole-word keyword hit
+        relevant_agents = [domain for domain in self.routing_keywords if hits[domain]]
         
         # If no specific domain detected, try to infer from context
         if not relevant_agents:
             # General AWS data engineering questions go to ingestion by default
-            if any(word in question_lower for word in ['aws', 'data', 'pipeline', 'architecture']):
+            if hits['general']:
                 relevant_agents.append('ingestion')
             else:
                 # For course-related questions, handle with coordinator
@@ -130,6 +185,65 @@ When routing questions:
         
         return relevant_agents
     
+    def get_specialist(self, domain: str):
+        """
+        Get the specialist agent for a domain, creating it on first use.
+        
+        Args:
+            domain: Routing domain ('ingestion', 'storage', 'security' or 'operations')
+            
+        Returns:
+            Specialist agent instance
+        """
+        agent = self._specialists.get(domain)
+        if agent is None:
+            with self._specialists_lock:
+                agent = self._specialists.get(domain)
+                if agent is None:
+                    agent_class = self.SPECIALISTS[domain][1]
+                    agent = self._specialists[domain] = agent_class(self.model_id)
+        return agent
+    
+    @property
+    def ingestion_agent(self) -> DataIngestionAgent:
+        """Data ingestion specialist."""
+        return self.get_specialist('ingestion')
+    
+    @property
+    def storage_agent(self) -> StorageAgent:
+        """Storage specialist."""
+        return self.get_specialist('storage')
+    
+    @property
+    def security_agent(self) -> SecurityAgent:
+        """Security specialist."""
+        return self.get_specialist('security')
+    
+    @property
+    def operations_agent(self) -> OperationsAgent:
+        """Operations specialist."""
+        return self.get_specialist('operations')
+    
+    def prewarm(self) -> threading.Thread:
+        """
+        Build the coordinator and specialist agents in a background thread.
+        
+        Returns:
+            The started daemon thread
+        """
+        def warm():
+            try:
+                self.coordinator.prewarm()
+                for domain in self.SPECIALISTS:
+                    self.get_specialist(domain).agent.prewarm()
+            except Exception:
+                # Agents are built on demand anyway; a failed pre-warm only costs latency
+                pass
+        
+        thread = threading.Thread(target=warm, name="agent-prewarm", daemon=True)
+        thread.start()
+        return thread
+    
     def route_question(self, question: str, context: str = "") -> str:
         """
         Route a question to the appropriate specialist agent(s) and return the response.
@@ -142,52 +256,259 @@ When routing questions:
             Response from the appropriate agent(s)
         """
         try:
+            hits = self.match_keywords(question)
+            
             # Check if this is a course/progress related question
-            course_keywords = ['progress', 'recommendation', 'next', 'complete', 'stats', 'course']
-            if any(keyword in question.lower() for keyword in course_keywords):
-                return self.coordinator.run(question)
+            if hits['course']:
+                return self.coordinator.run(self._coordinator_prompt(question, context))
             
             # Analyze which agents should handle the question
-            relevant_agents = self.analyze_question(question)
+            relevant_agents = self.analyze_question(question, hits)
             
             if 'coordinator' in relevant_agents:
-                return self.coordinator.run(question)
+                return self.coordinator.run(self._coordinator_prompt(question, context))
+            
+            cached = self._cached_answer(question, relevant_agents, context)
+            if cached is not None:
+                return cached
+            
+            # Identical questions asked while this one is being answered share its answer
+            return self._single_flight.do(
+                self._flight_key(question, relevant_agents, context),
+                lambda: self._answer_from_specialists(question, relevant_agents, context)
+            )
+                
+        except Exception as e:
+            return f"Error processing question: {str(e)}"
+    
+    def route_question_stream(self, question: str, context: str = "") -> Iterator[str]:
+        """
+        Route a question like route_question, but stream the answer as it is generated.
+        
+        Course questions and single-specialist questions stream straight from
+        the answering agent. Multi-specialist questions fan out concurrently
+        and then stream the synthesis from Bedrock.
+        
+        Args:
+            question: The user's question
+            context: Additional context from the conversation
             
-            responses = []
+        Yields:
+            Text chunks of the response
+        """
+        try:
+            hits = self.match_keywords(question)
             
-            # Route to appropriate specialist agents
-            if 'ingestion' in relevant_agents:
-                response = self.ingestion_agent.process_question(question, context)
-                responses.append(('Data Ingestion', response))
+            # Course/progress questions are handled by the coordinator itself
+            if hits['course']:
+                yield from stream_agent(self.coordinator, self._coordinator_prompt(question, context))
+                return
             
-            if 'storage' in relevant_agents:
-                response = self.storage_agent.process_question(question, context)
-                responses.append(('Storage', response))
+            relevant_agents = self.analyze_question(question, hits)
             
-            if 'security' in relevant_agents:
-                response = self.security_agent.process_question(question, context)
-                responses.append(('Security', response))
+            if 'coordinator' in relevant_agents:
+                yield from stream_agent(self.coordinator, self._coordinator_prompt(question, context))
+                return
             
-            if 'operations' in relevant_agents:
-                response = self.operations_agent.process_question(question, context)
-                responses.append(('Operations', response))
+            cached = self._cached_answer(question, relevant_agents, context)
+            if cached is not None:
+                yield cached
+                return
             
-            # Synthesize responses if multiple agents were involved
-            if len(responses) > 1:
-                return self._synthesize_responses(question, responses)
-            elif len(responses) == 1:
-                return responses[0][1]
-            else:
-                # Fallback to ingestion agent for general questions
-                return self.ingestion_agent.process_question(question, context)
+            # Identical questions asked while this one is being answered share its answer
+            yield from self._single_flight.do_stream(
+                self._flight_key(question, relevant_agents, context),
+                lambda: self._stream_from_specialists(question, relevant_agents, context)
+            )
                 
         except Exception as e:
-            return f"Error processing question: {str(e)}"
+            yield f"{ERROR_PREFIX} {str(e)}"
+    
+    def _answer_from_specialists(self, question: str, relevant_agents: List[str], context: str = "") -> str:
+        """
+        Ask the specialists for an answer and cache it if it is complete.
+        
+        Args:
+            question: The user's question
+            relevant_agents: Agent types from analyze_question
+            context: Additional context from the conversation
+            
+        Returns:
+            Response from the specialist(s), synthesized if there are several
+        """
+        # Route to appropriate specialist agents concurrently
+        responses, missing = self._ask_specialists(relevant_agents, question, context)
+        
+        # Synthesize responses if multiple agents were involved
+        if len(responses) > 1:
+            answer = self._synthesize_responses(question, responses)
+        elif len(responses) == 1:
+            answer = responses[0][1]
+        elif missing:
+            return f"Sorry, no answer was received from the {', '.join(missing)} specialist(s). Please try again."
+        else:
+            # Fallback to ingestion agent for general questions
+            return self.ingestion_agent.process_question(question, context)
+        
+        if missing:
+            answer += f"\n\n_Note: no answer was received from the {', '.join(missing)} specialist(s) in time, so this answer may be incomplete._"
+        elif not any(response.startswith(ERROR_PREFIX) for _, response in responses):
+            self._cache_answer(question, relevant_agents, answer, context)
+        return answer
+    
+    def _stream_from_specialists(self, question: str, relevant_agents: List[str], context: str = "") -> Iterator[str]:
+        """
+        Stream an answer from the specialists and cache it if it is complete.
+        
+        Args:
+            question: The user's question
+            relevant_agents: Agent types from analyze_question
+            context: Additional context from the conversation
+            
+        Yields:
+            Text chunks of the response
+        """
+        if len(relevant_agents) == 1:
+            agent = self.get_specialist(relevant_agents[0])
+            chunks = []
+            for chunk in agent.process_question_stream(question, context):
+                chunks.append(chunk)
+                yield chunk
+            if not any(chunk.startswith(ERROR_PREFIX) for chunk in chunks):
+                self._cache_answer(question, relevant_agents, "".join(chunks), context)
+            return
+        
+        # Several specialists: answers must be complete before they can be merged
+        responses, missing = self._ask_specialists(relevant_agents, question, context)
+        
+        if len(responses) > 1:
+            chunks = []
+            for chunk in self._synthesize_responses_stream(question, responses):
+                chunks.append(chunk)
+                yield chunk
+            answer = "".join(chunks)
+        elif len(responses) == 1:
+            answer = responses[0][1]
+            yield answer
+        else:
+            yield f"Sorry, no answer was received from the {', '.join(missing)} specialist(s). Please try again."
+            return
+        
+        if missing:
+            yield f"\n\n_Note: no answer was received from the {', '.join(missing)} specialist(s) in time, so this answer may be incomplete._"
+        elif not any(response.startswith(ERROR_PREFIX) for _, response in responses):
+            self._cache_answer(question, relevant_agents, answer, context)
+    
+    @staticmethod
+    def _coordinator_prompt(question: str, context: str = "") -> str:
+        """
+        Build the prompt for a question the coordinator answers itself.
+        
+        Pooled agents start every call with an empty conversation, so the
+        conversation context goes into the prompt, as it does for the specialists.
+        
+        Args:
+            question: The user's question
+            context: Additional context from the conversation
+            
+        Returns:
+            Prompt for the coordinator agent
+        """
+        if context:
+            return f"Context: {context}\n\nQuestion: {question}"
+        return question
+    
+    def _flight_key(self, question: str, relevant_agents: List[str], context: str) -> str:
+        """Key identical specialist requests like the answer cache does."""
+        return request_key(self.model_id, sorted(relevant_agents), normalize_question(question), context)
+    
+    def _cached_answer(self, question: str, relevant_agents: List[str], context: str = "") -> Optional[str]:
+        """
+        Look up a cached specialist answer.
+        
+        Only specialist answers are cached: course questions and general
+        questions go to the coordinator, whose progress tools make its answers
+        depend on the learner.
+        
+        Args:
+            question: The user's question
+            relevant_agents: Agent types from analyze_question
+            context: Conversation context sent to the specialists
+            
+        Returns:
+            The cached answer, or None on a miss or when caching is off
+        """
+        if self.response_cache is None:
+            return None
+        try:
+            return self.response_cache.get(question, relevant_agents, self.model_id, context)
+        except Exception:
+            # A broken cache must not stop questions from being answered
+            return None
+    
+    def _cache_answer(self, question: str, relevant_agents: List[str], answer: str, context: str = ""):
+        """
+        Cache a complete specialist answer.
+        
+        Args:
+            question: The user's question
+            relevant_agents: Agent types from analyze_question
+            answer: The answer to cache
+            context: Conversation context sent to the specialists
+        """
+        if self.response_cache is None:
+            return
+        try:
+            self.response_cache.put(question, relevant_agents, self.model_id, str(answer), context)
+        except Exception:
+            pass
+    
+    def _ask_specialists(self, relevant_agents: List[str], question: str,
+                         context: str = "") -> Tuple[List[Tuple[str, str]], List[str]]:
+        """
+        Ask the selected specialist agents concurrently.
+        
+        All specialists start together and share one deadline of
+        AGENT_TIMEOUT_SECONDS, so total latency approaches the slowest single
+        agent rather than the sum of all of them.
+        
+        Args:
+            relevant_agents: Agent types from analyze_question
+            question: The user's question
+            context: Additional context from the conversation
+            
+        Returns:
+            Tuple of (list of (agent_name, response) in routing order,
+            names of specialists that failed or timed out)
+        """
+        futures = [
+            (name, _specialist_executor.submit(self.get_specialist(domain).process_question, question, context))
+            for domain, (name, _) in self.SPECIALISTS.items() if domain in relevant_agents
+        ]
+        if not futures:
+            return [], []
+        
+        done, _ = wait([future for _, future in futures], timeout=AGENT_TIMEOUT_SECONDS)
+        
+        responses = []
+        missing = []
+        for name, future in futures:
+            if future in done and future.exception() is None:
+                responses.append((name, future.result()))
+            else:
+                # A timed-out agent keeps its worker until it finishes, but we stop waiting for it
+                future.cancel()
+                missing.append(name)
+        
+        return responses, missing
     
     def _synthesize_responses(self, question: str, responses: List[Tuple[str, str]]) -> str:
         """
         Synthesize responses from multiple specialist agents.
         
+        Answers that do not overlap are merged locally under headers; only
+        overlapping answers need the extra coordinator call.
+        
         Args:
             question: The original question
             responses: List of (agent_name, response) tuples
@@ -195,37 +516,93 @@ When routing questions:
         Returns:
             Synthesized response
         """
+        if not self._needs_synthesis(responses):
+            return self._combine_responses(responses)
+        
         try:
-            synthesis_prompt = f"""Question: {question}
+            synthesis_prompt = self._build_synthesis_prompt(question, responses)
+            return self.coordinator.run(synthesis_prompt)
+            
+        except Exception:
+            # Fallback: return all responses with headers
+            return self._combine_responses(responses)
+    
+    def _synthesize_responses_stream(self, question: str, responses: List[Tuple[str, str]]) -> Iterator[str]:
+        """
+        Stream the synthesis of responses from multiple specialist agents.
+        
+        Synthesis needs no tools, so it goes straight to Bedrock's streaming API.
+        
+        Args:
+            question: The original question
+            responses: List of (agent_name, response) tuples
+            
+        Yields:
+            Text chunks of the synthesized response
+        """
+        if not self._needs_synthesis(responses):
+            yield self._combine_responses(responses)
+            return
+        
+        started = False
+        try:
+            for chunk in get_bedrock_client().invoke_claude_stream(
+                self._build_synthesis_prompt(question, responses),
+                model_id=self.model_id,
+                system=self.system_prompt
+            ):
+                started = True
+                yield chunk
+                
+        except Exception:
+            # Fallback: return all responses with headers, unless text was already streamed
+            if started:
+                raise
+            yield self._combine_responses(responses)
+    
+    def _needs_synthesis(self, responses: List[Tuple[str, str]]) -> bool:
+        """
+        Check whether specialist answers repeat each other enough to need LLM synthesis.
+        
+        Args:
+            responses: List of (agent_name, response) tuples
+            
+        Returns:
+            True if any two answers share at least SYNTHESIS_OVERLAP_THRESHOLD of their phrases
+        """
+        return max_overlap([str(response) for _, response in responses]) >= SYNTHESIS_OVERLAP_THRESHOLD
+    
+    def _build_synthesis_prompt(self, question: str, responses: List[Tuple[str, str]]) -> str:
+        """Build the prompt asking the coordinator to merge specialist answers."""
+        synthesis_prompt = f"""Question: {question}
 
 I received responses from multiple specialist agents. Please synthesize these into a coherent, comprehensive answer:
 
 """
-            for agent_name, response in responses:
-                synthesis_prompt += f"**{agent_name} Agent Response:**\n{response}\n\n"
-            
-            synthesis_prompt += """Please provide a unified response that:
+        for agent_name, response in responses:
+            synthesis_prompt += f"**{agent_name} Agent Response:**\n{response}\n\n"
+        
+        synthesis_prompt += """Please provide a unified response that:
 1. Combines the relevant information from all agents
 2. Eliminates redundancy
 3. Provides a clear, actionable answer
 4. Maintains the practical, hands-on focus"""
-            
-            return self.coordinator.run(synthesis_prompt)
-            
-        except Exception as e:
-            # Fallback: return all responses with headers
-            result = f"Here are responses from multiple specialists:\n\n"
-            for agent_name, response in responses:
-                result += f"**{agent_name} Perspective:**\n{response}\n\n"
-            return result
+        
+        return synthesis_prompt
+    
+    def _combine_responses(self, responses: List[Tuple[str, str]]) -> str:
+        """Return all specialist responses under headers, without synthesis."""
+        result = f"Here are responses from multiple specialists:\n\n"
+        for agent_name, response in responses:
+            result += f"**{agent_name} Perspective:**\n{response}\n\n"
+        return result
     
     def get_agent_capabilities(self) -> Dict[str, List[str]]:
         """Return capabilities of all agents."""
+        # Capabilities are static, so no specialist needs to be created
         return {
-            'Data Ingestion': self.ingestion_agent.get_capabilities(),
-            'Storage': self.storage_agent.get_capabilities(),
-            'Security': self.security_agent.get_capabilities(),
-            'Operations': self.operations_agent.get_capabilities()
+            name: agent_class.get_capabilities()
+            for name, agent_class in self.SPECIALISTS.values()
         }
     
     def handle_course_navigation(self, request: str) -> str:
@@ -0,0 +1,51 @@
+"""
+Answer Overlap for AWS Data Engineer Course
+
+Measures how much specialist answers repeat each other, using word shingles
+(runs of consecutive words) and Jaccard similarity. The coordinator uses it
+to decide whether a multi-domain answer needs an LLM synthesis pass or can be
+merged locally.
+"""
+
+from itertools import combinations
+from typing import List, Set, Tuple
+
+from app.utils.content_index import tokenize
+
+# Words per shingle; long enough that shared phrases mean shared content
+SHINGLE_SIZE = 4
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[Tuple[str, ...]]:
+    """
+    Get the set of word shingles in a text.
+
+    Args:
+        text: Text to split
+        size: Number of consecutive words per shingle
+
+    Returns:
+        Set of word tuples
+    """
+    words = tokenize(text)
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def max_overlap(responses: List[str]) -> float:
+    """
+    Get the highest pairwise overlap between responses.
+
+    Args:
+        responses: Response texts
+
+    Returns:
+        Largest Jaccard similarity of shingle sets over all pairs (0 to 1)
+    """
+    shingle_sets = [shingles(response) for response in responses]
+    overlap = 0.0
+    for a, b in combinations(shingle_sets, 2):
+        if a and b:
+            overlap = max(overlap, len(a & b) / len(a | b))
+    return overlap
@@ -0,0 +1,85 @@
+"""
+Agent Pool for AWS Data Engineer Course
+
+A Strands agent keeps the conversation in `agent.messages` and refuses to run
+two invocations at once. The coordinator and its specialists are shared by
+every browser session in the process, so each role hands out agents from a
+pool instead: a caller gets an idle agent with an empty conversation, and a
+new one is created only when all of them are busy. Agents in a pool share one
+model object (and with it the Bedrock client), so extra agents are cheap.
+
+Pooled agents remember nothing between calls. Conversation history stays per
+session in st.session_state; the chat page condenses it with build_context,
+and the coordinator puts it in the prompt of every question it answers itself
+or routes to a specialist. The synthesis of specialist answers does not get it.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List
+
+from strands import Agent
+
+
+class AgentPool:
+    """Pool of identically configured Strands agents, usable in place of a single agent."""
+
+    def __init__(self, **agent_kwargs: Any):
+        """
+        Initialize the pool; agents are created on first use.
+
+        Args:
+            **agent_kwargs: Arguments passed to strands.Agent (model, tools, system_prompt)
+        """
+        self.agent_kwargs = agent_kwargs
+        self._idle: List[Agent] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[Agent]:
+        """
+        Borrow an agent for one invocation.
+
+        Yields:
+            An agent with an empty conversation, not used by any other caller
+        """
+        with self._lock:
+            agent = self._idle.pop() if self._idle else None
+        if agent is None:
+            agent = self._create()
+
+        agent.messages = []
+        try:
+            yield agent
+        finally:
+            with self._lock:
+                self._idle.append(agent)
+
+    def prewarm(self):
+        """Create an idle agent ahead of the first call if the pool has none."""
+        with self._lock:
+            if self._idle:
+                return
+        agent = self._create()
+        with self._lock:
+            self._idle.append(agent)
+
+    def run(self, prompt: str):
+        """
+        Run a prompt on a pooled agent.
+
+        Args:
+            prompt: Prompt to send
+
+        Returns:
+            The agent's response
+        """
+        with self.acquire() as agent:
+            return agent.run(prompt)
+
+    def _create(self) -> Agent:
+        """Create an agent, sharing the model object of the first one."""
+        agent = Agent(**self.agent_kwargs)
+        with self._lock:
+            self.agent_kwargs['model'] = agent.model
+        return agent
@@ -0,0 +1,58 @@
+"""
+Keyword Routing for AWS Data Engineer Course
+
+This module compiles the coordinator's routing vocabulary into a single regular
+expression so a question is scanned once for every domain at the same time.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List
+
+# Common inflections accepted after a keyword ("partitions", "streamed", "completed")
+KEYWORD_SUFFIX = r"(?:s|es|d|ed|ing)?"
+
+
+class KeywordMatcher:
+    """Matches whole-word keywords for many labels in one pass over the text."""
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        """
+        Compile the vocabulary.
+
+        Args:
+            vocabulary: Mapping of label (e.g. a domain) to its keywords; a keyword
+                        may appear under several labels
+        """
+        self.labels: Dict[str, List[str]] = {}
+        for label, keywords in vocabulary.items():
+            for keyword in keywords:
+                self.labels.setdefault(self._normalize(keyword), []).append(label)
+
+        # Longest keywords first so "data lake" wins over "data"
+        alternation = '|'.join(
+            r'\s+'.join(re.escape(word) for word in keyword.split())
+            for keyword in sorted(self.labels, key=len, reverse=True)
+        )
+        self.pattern = re.compile(rf"\b({alternation}){KEYWORD_SUFFIX}\b", re.IGNORECASE)
+
+    def match(self, text: str) -> Counter:
+        """
+        Count keyword hits per label.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Counter mapping each matched label to its number of keyword hits
+        """
+        hits = Counter()
+        for match in self.pattern.finditer(text):
+            for label in self.labels[self._normalize(match.group(1))]:
+                hits[label] += 1
+        return hits
+
+    @staticmethod
+    def _normalize(keyword: str) -> str:
+        """Lowercase a keyword and collapse internal whitespace."""
+        return ' '.join(keyword.lower().split())
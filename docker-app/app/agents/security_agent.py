@@ -5,15 +5,19 @@ This module implements the specialist agent for data security and governance top
 including IAM, Lake Formation, encryption, and compliance.
 """
 
-from strands import Agent
+from typing import Iterator
+from app.utils.bedrock_client import get_bedrock_model
+from .pool import AgentPool
 from app.tools import (
     content_retrieval_tool,
     content_search_tool,
+    semantic_search_tool,
     lab_retrieval_tool,
     aws_service_info_tool,
     aws_best_practices_tool,
     aws_architecture_patterns_tool
 )
+from .streaming import stream_agent
 
 
 class SecurityAgent:
@@ -53,11 +57,12 @@ Use your tools to:
 
 Always emphasize the importance of defense in depth and proper access controls."""
 
-        self.agent = Agent(
-            model=f"bedrock:{model_id}",
+        self.agent = AgentPool(
+            model=get_bedrock_model(model_id),
             tools=[
                 content_retrieval_tool,
                 content_search_tool,
+                semantic_search_tool,
                 lab_retrieval_tool,
                 aws_service_info_tool,
                 aws_best_practices_tool,
@@ -89,7 +94,28 @@ Always emphasize the importance of defense in depth and proper access controls."
         except Exception as e:
             return f"Error processing question: {str(e)}"
     
-    def get_capabilities(self) -> list:
+    def process_question_stream(self, question: str, context: str = "") -> Iterator[str]:
+        """
+        Stream the answer to a question related to data security.
+        
+        Args:
+            question: The user's question
+            context: Additional context from the conversation
+            
+        Yields:
+            Text chunks of the agent's response as they are generated
+        """
+        full_prompt = question
+        if context:
+            full_prompt = f"Context: {context}\n\nQuestion: {question}"
+        
+        try:
+            yield from stream_agent(self.agent, full_prompt)
+        except Exception as e:
+            yield f"Error processing question: {str(e)}"
+    
+    @staticmethod
+    def get_capabilities() -> list:
         """Return a list of this agent's capabilities."""
         return [
             "AWS Lake Formation security and governance",
@@ -5,16 +5,20 @@ This module implements the specialist agent for data storage topics including
 S3, Redshift, DynamoDB, and related storage services.
 """
 
-from strands import Agent
+from typing import Iterator
+from app.utils.bedrock_client import get_bedrock_model
+from .pool import AgentPool
 from app.tools import (
     content_retrieval_tool,
     content_search_tool,
+    semantic_search_tool,
     lab_retrieval_tool,
     aws_service_info_tool,
     aws_best_practices_tool,
     aws_architecture_patterns_tool,
     aws_cost_optimization_tool
 )
+from .streaming import stream_agent
 
 
 class StorageAgent:
@@ -53,11 +57,12 @@ Use your tools to:
 
 Focus on practical implementation details and real-world scenarios."""
 
-        self.agent = Agent(
-            model=f"bedrock:{model_id}",
+        self.agent = AgentPool(
+            model=get_bedrock_model(model_id),
             tools=[
                 content_retrieval_tool,
                 content_search_tool,
+                semantic_search_tool,
                 lab_retrieval_tool,
                 aws_service_info_tool,
                 aws_best_practices_tool,
@@ -90,7 +95,28 @@ Focus on practical implementation details and real-world scenarios."""
         except Exception as e:
             return f"Error processing question: {str(e)}"
     
-    def get_capabilities(self) -> list:
+    def process_question_stream(self, question: str, context: str = "") -> Iterator[str]:
+        """
+        Stream the answer to a question related to data storage.
+        
+        Args:
+            question: The user's question
+            context: Additional context from the conversation
+            
+        Yields:
+            Text chunks of the agent's response as they are generated
+        """
+        full_prompt = question
+        if context:
+            full_prompt = f"Context: {context}\n\nQuestion: {question}"
+        
+        try:
+            yield from stream_agent(self.agent, full_prompt)
+        except Exception as e:
+            yield f"Error processing question: {str(e)}"
+    
+    @staticmethod
+    def get_capabilities() -> list:
         """Return a list of this agent's capabilities."""
         return [
             "Amazon S3 data lake design and optimization",
@@ -0,0 +1,61 @@
+"""
+Streaming Helpers for AWS Data Engineer Course
+
+This module bridges Strands' asynchronous event stream to plain iterators of
+text chunks, which is what Streamlit's st.write_stream consumes.
+"""
+
+import asyncio
+import contextvars
+import queue
+import threading
+from typing import Iterator
+
+from .pool import AgentPool
+
+_DONE = object()
+
+
+def stream_agent(agents: AgentPool, prompt: str) -> Iterator[str]:
+    """
+    Run a pooled agent and yield its response text as it is generated.
+
+    The agent's async stream runs on its own event loop in a background thread,
+    so this works from Streamlit's script thread and from worker threads alike.
+    The thread holds the pooled agent until the response is complete, even if
+    the caller stops reading early.
+
+    Args:
+        agents: Pool to borrow the agent from
+        prompt: Prompt to send
+
+    Yields:
+        Text chunks of the agent's response
+    """
+    chunks: "queue.Queue" = queue.Queue()
+
+    async def consume(agent):
+        async for event in agent.stream_async(prompt):
+            if "data" in event:
+                chunks.put(event["data"])
+
+    def run():
+        try:
+            with agents.acquire() as agent:
+                asyncio.run(consume(agent))
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_DONE)
+
+    # Carry the caller's context variables (e.g. the learner identity) to the agent's tools
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name="agent-stream", daemon=True).start()
+
+    while True:
+        chunk = chunks.get()
+        if chunk is _DONE:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
@@ -0,0 +1,147 @@
+"""
+Course catalog for the AWS Data Engineer Course.
+
+The course structure (study guide sections, exam domains and labs) is
+declared once in app.config. This module builds it into immutable sections
+with prebuilt indexes: by id, by domain, in learning-path order, and with
+display names. Pages and tools read the structure from here instead of
+re-declaring lab, domain and name tables.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.config import STUDY_GUIDE_PATH, LABS_PATH, INTRODUCTION, EXAM_TIPS, DOMAINS, LABS
+
+
+@dataclass(frozen=True)
+class CourseSection:
+    """A study guide section or lab."""
+    id: str
+    section_type: str           # 'study_guide' or 'labs'
+    title: str
+    display_name: str           # e.g. "Domain 1: ...", "LAB1_1: ..."
+    file: str                   # Path relative to the study guide or labs directory
+    path: str                   # Path of the markdown file
+    domain: Optional[str] = None
+    weight: Optional[str] = None
+
+
+class CourseCatalog:
+    """The course structure with indexes for the lookups pages and tools need."""
+
+    def __init__(self, study_guide_path: str = STUDY_GUIDE_PATH, labs_path: str = LABS_PATH):
+        """
+        Build the catalog from the course configuration.
+
+        Args:
+            study_guide_path: Directory containing the study guide markdown files
+            labs_path: Directory containing the lab markdown files
+        """
+        def study_section(section_id: str, info: Dict, display_name: str, domain: Optional[str] = None):
+            return CourseSection(
+                id=section_id,
+                section_type="study_guide",
+                title=info["title"],
+                display_name=display_name,
+                file=info["file"],
+                path=os.path.join(study_guide_path, info["file"]),
+                domain=domain,
+                weight=info.get("weight")
+            )
+
+        # Learning path: introduction, the domains in order, then exam tips
+        self.domains: Tuple[CourseSection, ...] = tuple(
+            study_section(domain_id, info, f"Domain {domain_id[-1]}: {info['title']}", domain_id)
+            for domain_id, info in DOMAINS.items()
+        )
+        self.study_guide: Tuple[CourseSection, ...] = (
+            study_section("intro", INTRODUCTION, INTRODUCTION["title"]),
+            *self.domains,
+            study_section("exam_tips", EXAM_TIPS, EXAM_TIPS["title"])
+        )
+
+        self.labs: Tuple[CourseSection, ...] = tuple(
+            CourseSection(
+                id=lab_id,
+                section_type="labs",
+                title=info["title"],
+                display_name=f"{lab_id.upper()}: {info['title']}",
+                file=info["file"],
+                path=os.path.join(labs_path, info["file"]),
+                domain=info["domain"]
+            )
+            for lab_id, info in sorted(LABS.items())
+        )
+
+        self.sections: Tuple[CourseSection, ...] = self.study_guide + self.labs
+        self.by_id: Mapping[str, CourseSection] = MappingProxyType(
+            {section.id: section for section in self.sections}
+        )
+
+        labs_by_domain: Dict[str, List[CourseSection]] = {domain.id: [] for domain in self.domains}
+        for lab in self.labs:
+            labs_by_domain.setdefault(lab.domain, []).append(lab)
+        self.labs_by_domain: Mapping[str, Tuple[CourseSection, ...]] = MappingProxyType(
+            {domain_id: tuple(labs) for domain_id, labs in sorted(labs_by_domain.items())}
+        )
+
+    def get(self, section_id: str) -> Optional[CourseSection]:
+        """
+        Look up a section or lab by id.
+
+        Args:
+            section_id: Section id (e.g. 'intro', 'domain1', 'lab1_1')
+
+        Returns:
+            CourseSection, or None if the id is unknown
+        """
+        return self.by_id.get(section_id)
+
+    def display_name(self, section_id: str) -> str:
+        """
+        Get the name shown for a section in the UI.
+
+        Args:
+            section_id: Section id
+
+        Returns:
+            Display name, or the id itself if it is unknown
+        """
+        section = self.by_id.get(section_id)
+        return section.display_name if section else section_id
+
+    def section_ids(self, section_type: str) -> List[str]:
+        """
+        Get the ids of a section type in learning-path order.
+
+        Args:
+            section_type: 'study_guide' or 'labs'
+
+        Returns:
+            List of section ids
+        """
+        sections = self.study_guide if section_type == "study_guide" else self.labs
+        return [section.id for section in sections]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CourseCatalog:
+    """
+    Get the process-wide course catalog.
+
+    Returns:
+        CourseCatalog instance
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = CourseCatalog()
+    return _catalog
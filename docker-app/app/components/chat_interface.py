@@ -5,22 +5,31 @@ This module implements the Streamlit chat interface for interacting with the mul
 """
 
 import streamlit as st
-from typing import List, Dict, Any
-from app.agents import get_coordinator
-from app.config import BEDROCK_MODEL_ID
+from typing import List, Dict, Any, Optional
+from app.agents import CoordinatorAgent, get_coordinator
+from app.config import BEDROCK_MODEL_ID, STREAM_RESPONSES, CONTEXT_TOKEN_BUDGET
+from app.utils.conversation_context import build_context
+from app.utils.user_identity import acting_as, get_user_id
 
 
 def initialize_chat():
     """Initialize chat-related session state variables."""
     if "messages" not in st.session_state:
         st.session_state.messages = []
+
+
+def get_assistant() -> Optional[CoordinatorAgent]:
+    """
+    Get the coordinator shared by all sessions.
     
-    if "coordinator" not in st.session_state:
-        try:
-            st.session_state.coordinator = get_coordinator(BEDROCK_MODEL_ID)
-        except Exception as e:
-            st.error(f"Failed to initialize AI assistant: {str(e)}")
-            st.session_state.coordinator = None
+    Returns:
+        CoordinatorAgent instance, or None if it could not be created
+    """
+    try:
+        return get_coordinator(BEDROCK_MODEL_ID)
+    except Exception as e:
+        st.error(f"Failed to initialize AI assistant: {str(e)}")
+        return None
 
 
 def display_chat_interface():
@@ -47,14 +56,20 @@ def display_chat_interface():
         
         # Generate and display assistant response
         with st.chat_message("assistant"):
-            if st.session_state.coordinator:
+            coordinator = get_assistant()
+            if coordinator:
                 try:
-                    with st.spinner("Thinking..."):
-                        # Get context from recent messages
-                        context = get_conversation_context()
-                        response = st.session_state.coordinator.route_question(prompt, context)
-                    
-                    st.markdown(response)
+                    # Get context from recent messages
+                    context = get_conversation_context()
+                    with acting_as(get_user_id()):
+                        if STREAM_RESPONSES:
+                            response = st.write_stream(
+                                coordinator.route_question_stream(prompt, context)
+                            )
+                        else:
+                            with st.spinner("Thinking..."):
+                                response = coordinator.route_question(prompt, context)
+                            st.markdown(response)
                     
                     # Add assistant response to chat history
                     st.session_state.messages.append({"role": "assistant", "content": response})
@@ -95,8 +110,9 @@ def show_agent_capabilities():
     """Display information about agent capabilities."""
     st.subheader("🤖 AI Assistant Capabilities")
     
-    if st.session_state.coordinator:
-        capabilities = st.session_state.coordinator.get_agent_capabilities()
+    coordinator = get_assistant()
+    if coordinator:
+        capabilities = coordinator.get_agent_capabilities()
         
         for agent_name, agent_capabilities in capabilities.items():
             with st.expander(f"**{agent_name} Agent**"):
@@ -106,12 +122,15 @@ def show_agent_capabilities():
         st.error("AI assistant not available")
 
 
-def get_conversation_context(max_messages: int = 4) -> str:
+def get_conversation_context(max_tokens: int = CONTEXT_TOKEN_BUDGET) -> str:
     """
     Get recent conversation context for the AI assistant.
     
+    Recent messages are kept whole and older ones are summarized so the
+    context stays within a token budget.
+    
     Args:
-        max_messages: Maximum number of recent messages to include
+        max_tokens: Approximate token budget for the context
         
     Returns:
         Formatted conversation context
@@ -119,16 +138,12 @@ def get_conversation_context(max_messages: int = 4) -> str:
     if "messages" not in st.session_state or not st.session_state.messages:
         return ""
     
-    # Get recent messages
-    recent_messages = st.session_state.messages[-max_messages:]
+    # The question being answered is passed separately, so leave it out of the context
+    messages = st.session_state.messages
+    if messages[-1]["role"] == "user":
+        messages = messages[:-1]
     
-    context_parts = []
-    for message in recent_messages:
-        role = message["role"]
-        content = message["content"]
-        context_parts.append(f"{role.title()}: {content}")
-    
-    return "\n".join(context_parts)
+    return build_context(messages, max_tokens)
 
 
 def display_quick_actions():
@@ -166,10 +181,12 @@ def add_quick_question(question: str):
     st.session_state.messages.append({"role": "user", "content": question})
     
     # Process the question
-    if st.session_state.coordinator:
+    coordinator = get_assistant()
+    if coordinator:
         try:
             context = get_conversation_context()
-            response = st.session_state.coordinator.route_question(question, context)
+            with acting_as(get_user_id()):
+                response = coordinator.route_question(question, context)
             st.session_state.messages.append({"role": "assistant", "content": response})
         except Exception as e:
             error_msg = f"Error processing question: {str(e)}"
@@ -205,13 +222,17 @@ def display_embedded_chat():
             if st.button("Ask", key="embedded_ask"):
                 initialize_chat()
                 
-                if st.session_state.coordinator:
+                coordinator = get_assistant()
+                if coordinator:
                     try:
-                        with st.spinner("Getting answer..."):
-                            response = st.session_state.coordinator.route_question(prompt)
-                        
                         st.success("**Answer:**")
-                        st.markdown(response)
+                        with acting_as(get_user_id()):
+                            if STREAM_RESPONSES:
+                                st.write_stream(coordinator.route_question_stream(prompt))
+                            else:
+                                with st.spinner("Getting answer..."):
+                                    response = coordinator.route_question(prompt)
+                                st.markdown(response)
                         
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
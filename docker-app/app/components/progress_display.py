@@ -6,15 +6,14 @@ import streamlit as st
 from datetime import datetime
 import pandas as pd
 from app.utils.progress_tracker import ProgressTracker
+from app.catalog import get_catalog
 
-def display_progress_sidebar(tracker, domains, labs):
+def display_progress_sidebar(tracker):
     """
     Display progress information in the sidebar.
     
     Args:
         tracker (ProgressTracker): The progress tracker instance
-        domains (dict): Dictionary of domain information
-        labs (dict): Dictionary of lab information
     """
     with st.sidebar:
         st.subheader("Your Progress")
@@ -32,9 +31,9 @@ def display_progress_sidebar(tracker, domains, labs):
         st.progress(labs_progress / 100, f"Labs: {labs_progress:.1f}%")
         
         # Last updated
-        if "last_updated" in st.session_state.progress:
+        if tracker.get_last_updated():
             try:
-                last_updated = datetime.fromisoformat(st.session_state.progress["last_updated"])
+                last_updated = datetime.fromisoformat(tracker.get_last_updated())
                 st.caption(f"Last updated: {last_updated.strftime('%Y-%m-%d %H:%M')}")
             except:
                 pass
@@ -47,15 +46,15 @@ def display_progress_sidebar(tracker, domains, labs):
                 st.success("Progress reset successfully!")
                 st.rerun()
 
-def display_progress_dashboard(tracker, domains, labs):
+def display_progress_dashboard(tracker):
     """
     Display a comprehensive progress dashboard.
     
     Args:
         tracker (ProgressTracker): The progress tracker instance
-        domains (dict): Dictionary of domain information
-        labs (dict): Dictionary of lab information
     """
+    catalog = get_catalog()
+    
     st.title("Progress Dashboard")
     
     # Overall progress
@@ -72,31 +71,14 @@ def display_progress_dashboard(tracker, domains, labs):
         # Create a dataframe for study guide progress
         study_guide_data = []
         
-        # Add introduction
-        intro_complete = tracker.is_complete("study_guide", "intro")
-        study_guide_data.append({
-            "Section": "Introduction",
-            "Status": "✅ Complete" if intro_complete else "❌ Incomplete",
-            "Weight": "N/A"
-        })
-        
-        # Add domains
-        for domain_id, domain_info in domains.items():
-            domain_complete = tracker.is_complete("study_guide", domain_id)
+        for section in catalog.study_guide:
+            section_complete = tracker.is_complete("study_guide", section.id)
             study_guide_data.append({
-                "Section": f"Domain {domain_id[-1]}: {domain_info['title']}",
-                "Status": "✅ Complete" if domain_complete else "❌ Incomplete",
-                "Weight": domain_info['weight']
+                "Section": section.display_name,
+                "Status": "✅ Complete" if section_complete else "❌ Incomplete",
+                "Weight": section.weight or "N/A"
             })
         
-        # Add exam tips
-        exam_tips_complete = tracker.is_complete("study_guide", "exam_tips")
-        study_guide_data.append({
-            "Section": "Exam Preparation Tips",
-            "Status": "✅ Complete" if exam_tips_complete else "❌ Incomplete",
-            "Weight": "N/A"
-        })
-        
         # Display as a dataframe
         df = pd.DataFrame(study_guide_data)
         st.dataframe(df, use_container_width=True, hide_index=True)
@@ -104,34 +86,26 @@ def display_progress_dashboard(tracker, domains, labs):
     with tab2:
         st.subheader("Labs Progress")
         
-        # Group labs by domain
-        domain_labs = {}
-        for lab_id, lab_info in labs.items():
-            domain = lab_info["domain"]
-            if domain not in domain_labs:
-                domain_labs[domain] = []
-            domain_labs[domain].append((lab_id, lab_info))
-        
-        # Create a dataframe for labs progress
+        # Create a dataframe for labs progress, grouped by domain
         labs_data = []
         
-        for domain_id in sorted(domain_labs.keys()):
-            domain_num = domain_id[-1]
-            domain_title = domains[domain_id]["title"]
+        for domain_id, domain_labs in catalog.labs_by_domain.items():
+            if not domain_labs:
+                continue
             
             # Add a header row for the domain
             labs_data.append({
-                "Lab": f"Domain {domain_num}: {domain_title}",
+                "Lab": catalog.display_name(domain_id),
                 "Title": "",
                 "Status": ""
             })
             
             # Add rows for each lab in the domain
-            for lab_id, lab_info in sorted(domain_labs[domain_id]):
-                lab_complete = tracker.is_complete("labs", lab_id)
+            for lab in domain_labs:
+                lab_complete = tracker.is_complete("labs", lab.id)
                 labs_data.append({
-                    "Lab": lab_id.upper(),
-                    "Title": lab_info["title"],
+                    "Lab": lab.id.upper(),
+                    "Title": lab.title,
                     "Status": "✅ Complete" if lab_complete else "❌ Incomplete"
                 })
         
@@ -144,17 +118,7 @@ def display_progress_dashboard(tracker, domains, labs):
     if last_section_type and last_section_id:
         st.subheader("Continue Where You Left Off")
         
-        if last_section_type == "study_guide":
-            if last_section_id == "intro":
-                section_title = "Introduction"
-            elif last_section_id == "exam_tips":
-                section_title = "Exam Preparation Tips"
-            else:
-                domain_info = domains.get(last_section_id, {})
-                section_title = f"Domain {last_section_id[-1]}: {domain_info.get('title', '')}"
-        else:  # labs
-            lab_info = labs.get(last_section_id, {})
-            section_title = f"{last_section_id.upper()}: {lab_info.get('title', '')}"
+        section_title = catalog.display_name(last_section_id)
         
         if st.button(f"Continue with: {section_title}", use_container_width=True):
             st.session_state.current_page = last_section_id
@@ -13,6 +13,75 @@ AWS_PROFILE = os.getenv("AWS_PROFILE", "default")
 BEDROCK_REGION = os.getenv("BEDROCK_REGION", "us-east-1")
 BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
 
+# Bedrock health checks: "lazy" (only when requested) or "eager" (when a client is created)
+BEDROCK_HEALTH_CHECK = os.getenv("BEDROCK_HEALTH_CHECK", "lazy")
+BEDROCK_CACHE_TTL = float(os.getenv("BEDROCK_CACHE_TTL", "300"))
+
+# botocore settings shared by the Bedrock client and the agents' models
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50"))
+BEDROCK_RETRY_MODE = os.getenv("BEDROCK_RETRY_MODE", "adaptive")
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "5"))  # including the first try
+BEDROCK_CONNECT_TIMEOUT = float(os.getenv("BEDROCK_CONNECT_TIMEOUT", "10"))
+BEDROCK_READ_TIMEOUT = float(os.getenv("BEDROCK_READ_TIMEOUT", "300"))
+BEDROCK_TCP_KEEPALIVE = os.getenv("BEDROCK_TCP_KEEPALIVE", "true").lower() == "true"
+
+# Maximum in-flight requests per model from AsyncBedrockClient
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "8"))
+
+# Client-side per-model quotas (0 disables a limit) and the longest a request waits for capacity
+BEDROCK_RPM = int(os.getenv("BEDROCK_RPM", "0"))
+BEDROCK_TPM = int(os.getenv("BEDROCK_TPM", "0"))
+BEDROCK_RATE_LIMIT_WAIT = float(os.getenv("BEDROCK_RATE_LIMIT_WAIT", "60"))
+
+# Specialist agent fan-out
+AGENT_TIMEOUT_SECONDS = float(os.getenv("AGENT_TIMEOUT_SECONDS", "90"))
+AGENT_MAX_WORKERS = int(os.getenv("AGENT_MAX_WORKERS", "16"))
+AGENT_PREWARM = os.getenv("AGENT_PREWARM", "false").lower() == "true"
+
+# Multi-domain answers are only re-synthesized by the LLM when at least this share
+# of phrases overlaps between two specialists (0 always synthesizes)
+SYNTHESIS_OVERLAP_THRESHOLD = float(os.getenv("SYNTHESIS_OVERLAP_THRESHOLD", "0.1"))
+
+# Stream answers to the chat page as they are generated
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
+
+# Conversation context sent with each question: approximate token budget and
+# number of most recent messages kept whole (older ones are summarized)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_RECENT_MESSAGES = int(os.getenv("CONTEXT_RECENT_MESSAGES", "4"))
+
+# Answer cache: "memory", "sqlite" (shared between worker processes) or "off"
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "memory")
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", ".cache/responses.sqlite3")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "500"))
+# Minimum similarity for a near-duplicate cache hit (0 serves exact matches only)
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.0"))
+
+# Progress storage: "json" (one progress.json document holding every user),
+# "sharded" (one JSON file per user under PROGRESS_SHARD_DIR), "sqlite" (one row
+# per user and section, shared between worker processes) or "journal"
+# (append-only event log compacted into a snapshot every PROGRESS_COMPACT_EVENTS events)
+PROGRESS_STORE = os.getenv("PROGRESS_STORE", "json")
+PROGRESS_PATH = os.getenv("PROGRESS_PATH", "progress.json")
+PROGRESS_SHARD_DIR = os.getenv("PROGRESS_SHARD_DIR", ".cache/progress")
+PROGRESS_DB_PATH = os.getenv("PROGRESS_DB_PATH", ".cache/progress.sqlite3")
+PROGRESS_JOURNAL_PATH = os.getenv("PROGRESS_JOURNAL_PATH", ".cache/progress.jsonl")
+PROGRESS_COMPACT_EVENTS = int(os.getenv("PROGRESS_COMPACT_EVENTS", "500"))
+# Seconds the JSON progress store waits to batch changes into one background
+# write (0 writes synchronously on every change)
+PROGRESS_FLUSH_INTERVAL = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "1.0"))
+# Seconds a learner's progress is served from memory before it is reloaded from
+# the store, so changes made by other worker processes show up (0 reloads on every read)
+PROGRESS_RELOAD_INTERVAL = float(os.getenv("PROGRESS_RELOAD_INTERVAL", "5"))
+
+# Learner identity for progress, tried in order: an auth hook ("module:function"
+# returning the user id), a request header set by an authenticating proxy, then a
+# query parameter. Sessions without one share the "default" user.
+USER_ID_HOOK = os.getenv("USER_ID_HOOK", "")
+USER_ID_HEADER = os.getenv("USER_ID_HEADER", "")
+USER_ID_QUERY_PARAM = os.getenv("USER_ID_QUERY_PARAM", "")
+
 # Application Configuration
 APP_TITLE = "AWS Data Engineer Course"
 APP_ICON = "📊"
@@ -21,6 +90,36 @@ APP_ICON = "📊"
 STUDY_GUIDE_PATH = "content/study-guide"
 LABS_PATH = "content/labs"
 
+# Content index cache (persisted so container restarts reuse it)
+CONTENT_INDEX_PATH = os.getenv("CONTENT_INDEX_PATH", ".cache/content_index.json")
+
+# Ranked retrieval settings for content_retrieval_tool
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "5"))
+RETRIEVAL_CHAR_BUDGET = int(os.getenv("RETRIEVAL_CHAR_BUDGET", "6000"))
+
+# Embedding search settings for semantic_search_tool
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing")
+EMBEDDING_STORE_PATH = os.getenv("EMBEDDING_STORE_PATH", ".cache/embeddings")
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "4"))
+
+# AWS knowledge catalog used by the AWS tools (empty uses the bundled app/tools/data/aws_catalog.json)
+AWS_CATALOG_PATH = os.getenv("AWS_CATALOG_PATH", "")
+
+# Content watcher: "auto" (inotify via watchdog if installed, else polling), "inotify", "polling" or "off"
+CONTENT_WATCHER = os.getenv("CONTENT_WATCHER", "auto")
+CONTENT_POLL_INTERVAL = float(os.getenv("CONTENT_POLL_INTERVAL", "2.0"))
+
+# Study guide sections before and after the exam domains
+INTRODUCTION = {
+    "title": "Introduction",
+    "file": "00-introduction.md"
+}
+
+EXAM_TIPS = {
+    "title": "Exam Preparation Tips",
+    "file": "05-exam-preparation-tips.md"
+}
+
 # Define domains and their weights
 DOMAINS = {
     "domain1": {
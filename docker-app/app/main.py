@@ -1,8 +1,10 @@
 import streamlit as st
 import os
 import sys
-from app.config import DOMAINS, LABS, STUDY_GUIDE_PATH, LABS_PATH
+from app.catalog import get_catalog
 from app.utils.progress_tracker import ProgressTracker
+from app.utils.document_store import get_document_store
+from app.utils.content_watcher import start_content_watcher
 from app.components.progress_display import display_progress_sidebar, display_section_progress
 from app.components.chat_interface import display_embedded_chat, display_chat_sidebar
 
@@ -17,6 +19,12 @@ st.set_page_config(
 # Initialize progress tracker
 tracker = ProgressTracker()
 
+# Course structure: study guide sections and labs
+catalog = get_catalog()
+
+# Pick up edits to the mounted content volume without re-reading files on every rerun
+start_content_watcher()
+
 # Initialize session state
 if "current_page" not in st.session_state:
     st.session_state.current_page = "Home"
@@ -38,55 +46,36 @@ def sidebar_navigation():
             st.switch_page("pages/chat.py")
             
         st.subheader("Study Guide")
-        if st.button("Introduction", use_container_width=True):
-            st.session_state.current_page = "intro"
-            st.rerun()
-            
-        # Add domain buttons
-        for domain_key, domain_info in DOMAINS.items():
+        for section in catalog.study_guide:
             # Add completion indicator
-            is_complete = tracker.is_complete("study_guide", domain_key)
-            label = f"{'✅ ' if is_complete else ''}Domain {domain_key[-1]}: {domain_info['title']}"
+            is_complete = tracker.is_complete("study_guide", section.id)
+            label = f"{'✅ ' if is_complete else ''}{section.display_name}"
             
             if st.button(label, use_container_width=True):
-                st.session_state.current_page = domain_key
+                st.session_state.current_page = section.id
                 st.rerun()
-                
-        # Add completion indicator
-        exam_tips_complete = tracker.is_complete("study_guide", "exam_tips")
-        exam_tips_label = f"{'✅ ' if exam_tips_complete else ''}Exam Preparation Tips"
-        
-        if st.button(exam_tips_label, use_container_width=True):
-            st.session_state.current_page = "exam_tips"
-            st.rerun()
-        
-        # Group labs by domain
-        domain_labs = {}
-        for lab_key, lab_info in LABS.items():
-            domain = lab_info["domain"]
-            if domain not in domain_labs:
-                domain_labs[domain] = []
-            domain_labs[domain].append((lab_key, lab_info))
         
         # Display labs grouped by domain
         st.subheader("Labs")
-        for domain_key in sorted(domain_labs.keys()):
+        for domain_key, domain_labs in catalog.labs_by_domain.items():
+            if not domain_labs:
+                continue
             domain_num = domain_key[-1]
             st.markdown(f"**Domain {domain_num} Labs:**")
             
-            for lab_key, lab_info in sorted(domain_labs[domain_key]):
+            for lab in domain_labs:
                 # Add completion indicator
-                is_complete = tracker.is_complete("labs", lab_key)
-                label = f"{'✅ ' if is_complete else ''}{lab_key.upper()}: {lab_info['title']}"
+                is_complete = tracker.is_complete("labs", lab.id)
+                label = f"{'✅ ' if is_complete else ''}{lab.display_name}"
                 
-                if st.button(label, use_container_width=True, key=lab_key):
-                    st.session_state.current_page = lab_key
+                if st.button(label, use_container_width=True, key=lab.id):
+                    st.session_state.current_page = lab.id
                     st.rerun()
             
             st.markdown("---")
         
         # Display progress information
-        display_progress_sidebar(tracker, DOMAINS, LABS)
+        display_progress_sidebar(tracker)
         
         # Display chat sidebar
         display_chat_sidebar()
@@ -94,9 +83,8 @@ def sidebar_navigation():
 # Render markdown content
 def render_markdown(file_path):
     try:
-        with open(file_path, 'r') as file:
-            content = file.read()
-            st.markdown(content)
+        content = get_document_store().get_text(file_path)
+        st.markdown(content)
     except Exception as e:
         st.error(f"Error loading content: {e}")
         st.error(f"File path: {file_path}")
@@ -154,51 +142,17 @@ def main_content():
         if last_section_type and last_section_id:
             st.subheader("Continue Where You Left Off")
             
-            if last_section_type == "study_guide":
-                if last_section_id == "intro":
-                    section_title = "Introduction"
-                elif last_section_id == "exam_tips":
-                    section_title = "Exam Preparation Tips"
-                else:
-                    domain_info = DOMAINS.get(last_section_id, {})
-                    section_title = f"Domain {last_section_id[-1]}: {domain_info.get('title', '')}"
-            else:  # labs
-                lab_info = LABS.get(last_section_id, {})
-                section_title = f"{last_section_id.upper()}: {lab_info.get('title', '')}"
+            section_title = catalog.display_name(last_section_id)
             
             if st.button(f"Continue with: {section_title}", use_container_width=True):
                 st.session_state.current_page = last_section_id
                 st.rerun()
         
-    elif st.session_state.current_page == "intro":
-        display_section_progress(tracker, "study_guide", "intro", "Introduction")
-        render_markdown(f"{STUDY_GUIDE_PATH}/00-introduction.md")
-        
-    # Handle domain pages
-    elif st.session_state.current_page in DOMAINS:
-        domain_info = DOMAINS[st.session_state.current_page]
-        display_section_progress(
-            tracker, 
-            "study_guide", 
-            st.session_state.current_page, 
-            f"Domain {st.session_state.current_page[-1]}: {domain_info['title']}"
-        )
-        render_markdown(f"{STUDY_GUIDE_PATH}/{domain_info['file']}")
-        
-    elif st.session_state.current_page == "exam_tips":
-        display_section_progress(tracker, "study_guide", "exam_tips", "Exam Preparation Tips")
-        render_markdown(f"{STUDY_GUIDE_PATH}/05-exam-preparation-tips.md")
-        
-    # Handle lab pages
-    elif st.session_state.current_page in LABS:
-        lab_info = LABS[st.session_state.current_page]
-        display_section_progress(
-            tracker, 
-            "labs", 
-            st.session_state.current_page, 
-            f"{st.session_state.current_page.upper()}: {lab_info['title']}"
-        )
-        render_markdown(f"{LABS_PATH}/{lab_info['file']}")
+    # Handle study guide and lab pages
+    elif st.session_state.current_page in catalog.by_id:
+        section = catalog.by_id[st.session_state.current_page]
+        display_section_progress(tracker, section.section_type, section.id, section.display_name)
+        render_markdown(section.path)
     
     else:
         st.error(f"Page not found: {st.session_state.current_page}")
@@ -6,6 +6,7 @@ This page provides a dedicated interface for interacting with the AI assistant.
 
 import streamlit as st
 from app.components.chat_interface import display_chat_page
+from app.utils.content_watcher import start_content_watcher
 
 # Set page configuration
 st.set_page_config(
@@ -14,5 +15,8 @@ st.set_page_config(
     layout="wide"
 )
 
+# Pick up edits to the mounted content volume while agents read it
+start_content_watcher()
+
 # Display the chat page
 display_chat_page()
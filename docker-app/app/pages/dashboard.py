@@ -5,7 +5,6 @@ Progress dashboard page for the AWS Data Engineer Course.
 import streamlit as st
 from app.utils.progress_tracker import ProgressTracker
 from app.components.progress_display import display_progress_dashboard
-from app.config import DOMAINS, LABS
 
 # Set page configuration
 st.set_page_config(
@@ -19,7 +18,7 @@ st.set_page_config(
 tracker = ProgressTracker()
 
 # Display the progress dashboard
-display_progress_dashboard(tracker, DOMAINS, LABS)
+display_progress_dashboard(tracker)
 
 # Add a link back to the main app
 st.markdown("---")
@@ -7,6 +7,7 @@ This module exports all custom tools for use with Strands Agents.
 from .content_tools import (
     content_retrieval_tool,
     content_search_tool,
+    semantic_search_tool,
     lab_retrieval_tool,
     get_section_content
 )
@@ -30,6 +31,7 @@ __all__ = [
     # Content tools
     'content_retrieval_tool',
     'content_search_tool', 
+    'semantic_search_tool',
     'lab_retrieval_tool',
     'get_section_content',
     
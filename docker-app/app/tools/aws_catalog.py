@@ -0,0 +1,219 @@
+"""
+AWS Knowledge Catalog for AWS Data Engineer Agents
+
+The service, best practice, architecture pattern and cost optimization tables
+used by the AWS tools live in a versioned JSON data file (data/aws_catalog.json).
+The file is loaded once per process, and every entry's markdown is rendered up
+front, so a tool call is a dictionary lookup.
+
+Names are resolved exactly first, then through each table's aliases
+("KDS" -> kinesis, "s3 glacier" -> s3), and finally by fuzzy matching against
+keys and aliases to tolerate typos.
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from app.config import AWS_CATALOG_PATH
+
+CATALOG_VERSION = 1
+
+# Catalog bundled with the app, used unless AWS_CATALOG_PATH points elsewhere
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "data", "aws_catalog.json")
+
+# Minimum similarity for a fuzzy name match
+FUZZY_CUTOFF = 0.75
+
+_PREFIXES = ("aws", "amazon")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a service, domain or pattern name for lookup.
+
+    Args:
+        name: Name as typed (e.g. "Amazon Kinesis Firehose", "data_lake")
+
+    Returns:
+        Lowercase, hyphen-separated name without a leading AWS/Amazon
+    """
+    words = re.findall(r"[a-z0-9]+", name.lower())
+    while len(words) > 1 and words[0] in _PREFIXES:
+        words = words[1:]
+    return "-".join(words)
+
+
+class CatalogTable:
+    """Immutable table of catalog entries with pre-rendered markdown and name lookup."""
+
+    def __init__(self, entries: Dict[str, Any], aliases: Dict[str, List[str]],
+                 render: Callable[[str, Any], str]):
+        """
+        Build the table.
+
+        Args:
+            entries: Entry data by key, in display order
+            aliases: Alternative names by key
+            render: Function rendering (key, entry) to markdown
+        """
+        self.entries: Mapping[str, Any] = MappingProxyType(entries)
+        self.markdown: Mapping[str, str] = MappingProxyType(
+            {key: render(key, entry) for key, entry in entries.items()}
+        )
+
+        names = {normalize_name(key): key for key in entries}
+        for key, key_aliases in aliases.items():
+            if key not in entries:
+                raise ValueError(f"Alias for unknown catalog entry: {key}")
+            for alias in key_aliases:
+                names.setdefault(normalize_name(alias), key)
+        self._names: Mapping[str, str] = MappingProxyType(names)
+
+        # Bound per table so each table has its own cache
+        self.resolve = lru_cache(maxsize=1024)(self._resolve)
+
+    def keys(self) -> List[str]:
+        """Return the entry keys in display order."""
+        return list(self.entries)
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Get the rendered markdown for a name.
+
+        Args:
+            name: Entry key, alias, or a close misspelling of either
+
+        Returns:
+            Markdown, or None if nothing matches
+        """
+        key = self.resolve(name)
+        return self.markdown[key] if key else None
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """Resolve a name to an entry key by exact, alias, then fuzzy matching."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+        if normalized in self._names:
+            return self._names[normalized]
+
+        matches = difflib.get_close_matches(normalized, self._names.keys(), n=1, cutoff=FUZZY_CUTOFF)
+        return self._names[matches[0]] if matches else None
+
+
+def _bullets(items: List[str]) -> str:
+    return '\n'.join(f"• {item}" for item in items)
+
+
+def _numbered(items: List[str]) -> str:
+    return '\n'.join(f"{i+1}. {item}" for i, item in enumerate(items))
+
+
+def render_service(key: str, service_info: Dict[str, Any]) -> str:
+    """Render a service entry."""
+    return f"""**{service_info['name']}**
+*Category: {service_info['category']}*
+
+**Description:**
+{service_info['description']}
+
+**Key Features:**
+{_bullets(service_info['key_features'])}
+
+**Common Use Cases:**
+{_bullets(service_info['use_cases'])}
+
+**Pricing Model:**
+{service_info['pricing']}
+"""
+
+
+def render_best_practices(key: str, practices: Dict[str, Any]) -> str:
+    """Render a best practices entry."""
+    return f"**{practices['title']}**\n\n" + _numbered(practices['practices'])
+
+
+def render_pattern(key: str, pattern: Dict[str, Any]) -> str:
+    """Render an architecture pattern entry."""
+    result = f"**{pattern['name']}**\n\n"
+    result += f"**Description:**\n{pattern['description']}\n\n"
+    result += "**Key Components:**\n"
+    result += _bullets(pattern['components'])
+    result += "\n\n**Data Flow:**\n"
+    result += _numbered(pattern['flow'])
+    return result
+
+
+def render_cost_tips(key: str, tips: List[str]) -> str:
+    """Render a cost optimization entry."""
+    return f"**Cost Optimization Tips for {key.upper()}:**\n\n" + _bullets(tips)
+
+
+def render_general_cost_tips(tips: List[str]) -> str:
+    """Render the general cost optimization tips shown when no service is named."""
+    return "**General AWS Cost Optimization Tips:**\n\n" + _bullets(tips)
+
+
+class AwsCatalog:
+    """All AWS knowledge tables, loaded from the catalog data file."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Build the catalog.
+
+        Args:
+            data: Parsed catalog data file
+        """
+        if data.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Unsupported AWS catalog version: {data.get('version')}")
+
+        self.version = data["version"]
+        self.services = self._table(data, "services", render_service)
+        self.best_practices = self._table(data, "best_practices", render_best_practices)
+        self.architecture_patterns = self._table(data, "architecture_patterns", render_pattern)
+        self.cost_tips = self._table(data, "cost_tips", render_cost_tips)
+        self.general_cost_tips = render_general_cost_tips(self.cost_tips.entries["general"])
+
+    @classmethod
+    def load(cls, path: str = "") -> "AwsCatalog":
+        """
+        Load the catalog from a JSON data file.
+
+        Args:
+            path: Catalog file path (defaults to AWS_CATALOG_PATH or the bundled catalog)
+
+        Returns:
+            AwsCatalog instance
+        """
+        with open(path or AWS_CATALOG_PATH or DEFAULT_CATALOG_PATH, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _table(data: Dict[str, Any], name: str, render: Callable[[str, Any], str]) -> CatalogTable:
+        section = data[name]
+        return CatalogTable(section["entries"], section.get("aliases", {}), render)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_aws_catalog() -> AwsCatalog:
+    """
+    Get the process-wide AWS catalog, loading it on first use.
+
+    Returns:
+        AwsCatalog instance
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = AwsCatalog.load()
+    return _catalog
@@ -5,69 +5,44 @@ This module implements tools for accessing and retrieving information from study
 """
 
 import os
-import glob
 from typing import List, Dict, Any
 from strands import tool
 import markdown
 import re
+from app.config import LABS_PATH, RETRIEVAL_TOP_K, RETRIEVAL_CHAR_BUDGET, SEMANTIC_TOP_K
+from app.catalog import get_catalog
+from app.utils.content_index import get_content_index
+from app.utils.section_ranker import get_section_ranker
+from app.utils.embedding_store import get_embedding_store
+from app.utils.document_store import get_document_store
 
 
 @tool
 def content_retrieval_tool(topic: str, domain: str = "") -> str:
     """
-    Retrieves relevant content from study materials based on topic and optional domain.
+    Retrieves the most relevant study guide and lab sections for a topic.
     
     Args:
-        topic: The topic or concept to search for
+        topic: The topic, concept or question to look up
         domain: Optional domain filter (domain1, domain2, domain3, domain4)
         
     Returns:
-        Relevant content from study materials
+        Relevant sections from study materials, best match first
     """
     try:
-        content_path = "content/study-guide"
-        results = []
+        ranker = get_section_ranker()
+        sections = ranker.search(
+            topic,
+            top_k=RETRIEVAL_TOP_K,
+            char_budget=RETRIEVAL_CHAR_BUDGET,
+            domain=domain
+        )
         
-        # Get all markdown files
-        if domain:
-            # Map domain to file pattern
-            domain_files = {
-                "domain1": "*data-ingestion*",
-                "domain2": "*storage*",
-                "domain3": "*security*",
-                "domain4": "*operations*"
-            }
-            pattern = domain_files.get(domain, "*")
-            files = glob.glob(f"{content_path}/{pattern}.md")
-        else:
-            files = glob.glob(f"{content_path}/*.md")
-        
-        # Search through files
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Simple keyword search (case-insensitive)
-                if topic.lower() in content.lower():
-                    # Extract relevant sections
-                    lines = content.split('\n')
-                    relevant_lines = []
-                    
-                    for i, line in enumerate(lines):
-                        if topic.lower() in line.lower():
-                            # Include context around the match
-                            start = max(0, i - 3)
-                            end = min(len(lines), i + 4)
-                            context = '\n'.join(lines[start:end])
-                            relevant_lines.append(context)
-                    
-                    if relevant_lines:
-                        file_name = os.path.basename(file_path)
-                        results.append(f"From {file_name}:\n" + '\n---\n'.join(relevant_lines))
-        
-        if results:
-            return '\n\n'.join(results)
+        if sections:
+            return '\n\n---\n\n'.join(
+                f"From {section.source} ({section.title}):\n{section.text}"
+                for section in sections
+            )
         else:
             return f"No specific content found for '{topic}'. You may want to browse the study materials or ask a more general question."
             
@@ -87,35 +62,24 @@ def content_search_tool(query: str) -> str:
         Search results with file names and relevant excerpts
     """
     try:
-        content_path = "content/study-guide"
+        index = get_content_index()
         results = []
         
-        # Get all markdown files
-        files = glob.glob(f"{content_path}/*.md")
+        # Look up matching lines in the index (case-insensitive)
+        matches = index.find(query)
         
-        for file_path in files:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Search for query (case-insensitive)
-                if query.lower() in content.lower():
-                    file_name = os.path.basename(file_path).replace('.md', '').replace('-', ' ').title()
-                    
-                    # Find all occurrences with context
-                    lines = content.split('\n')
-                    matches = []
-                    
-                    for i, line in enumerate(lines):
-                        if query.lower() in line.lower():
-                            # Get surrounding context
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            context = '\n'.join(lines[start:end]).strip()
-                            matches.append(context)
-                    
-                    if matches:
-                        results.append(f"**{file_name}**:\n" + '\n\n'.join(matches[:3]))  # Limit to 3 matches per file
+        for file_name, line_numbers in matches.items():
+            title = file_name.replace('.md', '').replace('-', ' ').title()
+            lines = index.get_lines(file_name)
+            contexts = []
+            
+            for i in line_numbers[:3]:  # Limit to 3 matches per file
+                # Get surrounding context
+                start = max(0, i - 2)
+                end = min(len(lines), i + 3)
+                contexts.append('\n'.join(lines[start:end]).strip())
+            
+            results.append(f"**{title}**:\n" + '\n\n'.join(contexts))
         
         if results:
             return '\n\n---\n\n'.join(results)
@@ -126,6 +90,34 @@ def content_search_tool(query: str) -> str:
         return f"Error searching content: {str(e)}"
 
 
+@tool
+def semantic_search_tool(question: str) -> str:
+    """
+    Finds study material passages that are semantically similar to a question,
+    even when they don't share its exact keywords.
+    
+    Args:
+        question: Natural-language question or description of the topic
+        
+    Returns:
+        The most similar passages from the study guide and labs
+    """
+    try:
+        store = get_embedding_store()
+        chunks = store.search(question, top_k=SEMANTIC_TOP_K)
+        
+        if chunks:
+            return '\n\n---\n\n'.join(
+                f"From {chunk['source']} ({chunk['title']}):\n{chunk['text']}"
+                for chunk in chunks
+            )
+        else:
+            return f"No similar content found for '{question}'. Try rephrasing the question or searching for specific terms."
+            
+    except Exception as e:
+        return f"Error running semantic search: {str(e)}"
+
+
 @tool
 def lab_retrieval_tool(lab_id: str = "") -> str:
     """
@@ -138,36 +130,16 @@ def lab_retrieval_tool(lab_id: str = "") -> str:
         Lab instructions and resources
     """
     try:
-        labs_path = "content/labs"
+        catalog = get_catalog()
+        labs_path = LABS_PATH
         
         if lab_id:
-            # Map lab_id to file path (this would need to match your config.py)
-            lab_mapping = {
-                "lab1_1": "data-ingestion/lab-1.1-batch-ingestion-glue.md",
-                "lab1_2": "data-ingestion/lab-1.2-streaming-kinesis.md",
-                "lab1_3": "data-ingestion/lab-1.3-database-migration-dms.md",
-                "lab2_1": "data-storage/lab-2.1-s3-data-lake.md",
-                "lab2_2": "data-storage/lab-2.2-redshift-warehouse.md",
-                "lab2_3": "data-storage/lab-2.3-dynamodb-nosql.md",
-                "lab3_1": "data-transformation/lab-3.1-etl-glue.md",
-                "lab3_2": "data-transformation/lab-3.2-stream-processing.md",
-                "lab3_3": "data-transformation/lab-3.3-data-quality.md",
-                "lab4_1": "security-governance/lab-4.1-lake-formation.md",
-                "lab4_2": "security-governance/lab-4.2-column-security.md",
-                "lab4_3": "security-governance/lab-4.3-cross-account.md",
-                "lab5_1": "operations-optimization/lab-5.1-step-functions.md",
-                "lab5_2": "operations-optimization/lab-5.2-monitoring.md",
-                "lab5_3": "operations-optimization/lab-5.3-cost-optimization.md"
-            }
-            
-            file_path = lab_mapping.get(lab_id)
-            if file_path:
-                full_path = f"{labs_path}/{file_path}"
-                if os.path.exists(full_path):
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        return f.read()
+            lab = catalog.get(lab_id)
+            if lab and lab.section_type == "labs":
+                if os.path.exists(lab.path):
+                    return get_document_store().get_text(lab.path)
                 else:
-                    return f"Lab file not found: {full_path}"
+                    return f"Lab file not found: {lab.path}"
             else:
                 return f"Unknown lab ID: {lab_id}"
         else:
@@ -186,37 +158,37 @@ def lab_retrieval_tool(lab_id: str = "") -> str:
 
 
 @tool
-def get_section_content(section: str) -> str:
+def get_section_content(section: str, heading: str = "") -> str:
     """
     Gets the full content of a specific study guide section.
     
     Args:
         section: Section identifier (intro, domain1, domain2, domain3, domain4, exam_tips)
+        heading: Optional heading within the section (e.g. 'Task Statement 1.2') to return
+                 only that part, including its subsections
         
     Returns:
         Full content of the specified section
     """
     try:
-        content_path = "content/study-guide"
+        catalog = get_catalog()
         
-        # Map sections to files
-        section_files = {
-            "intro": "00-introduction.md",
-            "domain1": "01-data-ingestion-transformation.md",
-            "domain2": "02-storage-data-management.md",
-            "domain3": "03-data-security-access-control.md",
-            "domain4": "04-data-operations-optimization.md",
-            "exam_tips": "05-exam-preparation-tips.md"
-        }
+        entry = catalog.get(section)
+        if not entry or entry.section_type != "study_guide":
+            return f"Unknown section: {section}. Available sections: {', '.join(catalog.section_ids('study_guide'))}"
         
-        file_name = section_files.get(section)
-        if not file_name:
-            return f"Unknown section: {section}. Available sections: {', '.join(section_files.keys())}"
-        
-        file_path = f"{content_path}/{file_name}"
+        file_path = entry.path
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            document = get_document_store().get(file_path)
+            if not heading:
+                return document.text
+            
+            match = document.find_section(heading)
+            if match:
+                return document.full_text(match)
+            
+            headings = [s.title for s in document.walk() if 0 < s.level <= 3]
+            return f"Heading '{heading}' not found in {section}. Available headings: {', '.join(headings)}"
         else:
             return f"Section file not found: {file_path}"
             
@@ -2,11 +2,15 @@
 Progress Tools for AWS Data Engineer Agents
 
 This module implements tools for tracking and updating user progress through the course.
+Tools run on agent threads outside the Streamlit script, so they read and update
+the learner's progress through the shared progress repository.
 """
 
 from typing import Dict, List, Any, Tuple
 from strands import tool
-from app.utils.progress_tracker import ProgressTracker
+from app.utils.progress_repository import get_progress_repository
+from app.utils.user_identity import get_user_id
+from app.catalog import get_catalog
 
 
 @tool
@@ -18,19 +22,19 @@ def get_progress_tool() -> str:
         Formatted progress information including completion percentages and sections completed
     """
     try:
-        tracker = ProgressTracker()
+        progress = get_progress_repository().get(get_user_id())
         
         # Get overall progress
-        overall_progress = tracker.get_completion_percentage()
-        study_guide_progress = tracker.get_completion_percentage("study_guide")
-        labs_progress = tracker.get_completion_percentage("labs")
+        overall_progress = progress.completion_percentage()
+        study_guide_progress = progress.completion_percentage("study_guide")
+        labs_progress = progress.completion_percentage("labs")
         
         # Get completed sections
-        completed_study = tracker.get_completed_sections("study_guide")
-        completed_labs = tracker.get_completed_sections("labs")
+        completed_study = progress.completed_sections("study_guide")
+        completed_labs = progress.completed_sections("labs")
         
         # Get last visited section
-        last_section_type, last_section_id = tracker.get_last_visited()
+        last_section_type, last_section_id = progress.last_visited()
         
         progress_info = f"""**Current Progress Summary:**
 
@@ -68,13 +72,14 @@ def update_progress_tool(section_type: str, section_id: str, completed: bool = T
         Confirmation message about the progress update
     """
     try:
-        tracker = ProgressTracker()
+        repository = get_progress_repository()
+        user_id = get_user_id()
         
         if completed:
-            tracker.mark_complete(section_type, section_id)
+            repository.mark_complete(user_id, section_type, section_id, True)
             return f"✅ Marked {section_type} section '{section_id}' as completed!"
         else:
-            tracker.mark_incomplete(section_type, section_id)
+            repository.mark_complete(user_id, section_type, section_id, False)
             return f"⏳ Marked {section_type} section '{section_id}' as incomplete."
             
     except Exception as e:
@@ -90,88 +95,33 @@ def get_recommendations_tool() -> str:
         Personalized recommendations for what to study next
     """
     try:
-        tracker = ProgressTracker()
+        progress = get_progress_repository().get(get_user_id())
         
         # Get current progress
-        completed_study = set(tracker.get_completed_sections("study_guide"))
-        completed_labs = set(tracker.get_completed_sections("labs"))
+        completed_study = set(progress.completed_sections("study_guide"))
+        completed_labs = set(progress.completed_sections("labs"))
         
-        # Define learning path
-        study_sections = ["intro", "domain1", "domain2", "domain3", "domain4", "exam_tips"]
-        lab_sections = ["lab1_1", "lab1_2", "lab1_3", "lab2_1", "lab2_2", "lab2_3", 
-                       "lab3_1", "lab3_2", "lab3_3", "lab4_1", "lab4_2", "lab4_3",
-                       "lab5_1", "lab5_2", "lab5_3"]
+        catalog = get_catalog()
         
         recommendations = []
         
-        # Study guide recommendations
-        for section in study_sections:
-            if section not in completed_study:
-                section_names = {
-                    "intro": "Introduction to AWS Data Engineering",
-                    "domain1": "Data Ingestion and Transformation",
-                    "domain2": "Storage and Data Management", 
-                    "domain3": "Data Security and Access Control",
-                    "domain4": "Data Operations and Optimization",
-                    "exam_tips": "Exam Preparation Tips"
-                }
-                recommendations.append(f"📚 Study Guide: {section_names.get(section, section)}")
-                break  # Recommend next incomplete section
+        # Study guide recommendations: next incomplete section in the learning path
+        for section in catalog.study_guide:
+            if section.id not in completed_study:
+                recommendations.append(f"📚 Study Guide: {section.title}")
+                break
         
         # Lab recommendations based on completed study sections
-        if "domain1" in completed_study:
-            domain1_labs = ["lab1_1", "lab1_2", "lab1_3", "lab3_1", "lab3_2", "lab3_3"]
-            for lab in domain1_labs:
-                if lab not in completed_labs:
-                    lab_names = {
-                        "lab1_1": "Batch Data Ingestion with AWS Glue",
-                        "lab1_2": "Streaming Data with Amazon Kinesis",
-                        "lab1_3": "Database Migration with AWS DMS",
-                        "lab3_1": "ETL with AWS Glue",
-                        "lab3_2": "Stream Processing with Kinesis Analytics",
-                        "lab3_3": "Data Quality and Validation"
-                    }
-                    recommendations.append(f"🧪 Lab: {lab_names.get(lab, lab)}")
-                    break
-        
-        if "domain2" in completed_study:
-            domain2_labs = ["lab2_1", "lab2_2", "lab2_3"]
-            for lab in domain2_labs:
-                if lab not in completed_labs:
-                    lab_names = {
-                        "lab2_1": "S3 Data Lake Organization",
-                        "lab2_2": "Amazon Redshift Data Warehouse Setup",
-                        "lab2_3": "DynamoDB NoSQL Database Design"
-                    }
-                    recommendations.append(f"🧪 Lab: {lab_names.get(lab, lab)}")
-                    break
-        
-        if "domain3" in completed_study:
-            domain3_labs = ["lab4_1", "lab4_2", "lab4_3"]
-            for lab in domain3_labs:
-                if lab not in completed_labs:
-                    lab_names = {
-                        "lab4_1": "Data Governance with AWS Lake Formation",
-                        "lab4_2": "Column-Level Security",
-                        "lab4_3": "Cross-Account Data Sharing"
-                    }
-                    recommendations.append(f"🧪 Lab: {lab_names.get(lab, lab)}")
-                    break
-        
-        if "domain4" in completed_study:
-            domain4_labs = ["lab5_1", "lab5_2", "lab5_3"]
-            for lab in domain4_labs:
-                if lab not in completed_labs:
-                    lab_names = {
-                        "lab5_1": "Pipeline Orchestration with AWS Step Functions",
-                        "lab5_2": "Monitoring and Alerting",
-                        "lab5_3": "Cost Optimization Strategies"
-                    }
-                    recommendations.append(f"🧪 Lab: {lab_names.get(lab, lab)}")
+        for domain in catalog.domains:
+            if domain.id not in completed_study:
+                continue
+            for lab in catalog.labs_by_domain.get(domain.id, ()):
+                if lab.id not in completed_labs:
+                    recommendations.append(f"🧪 Lab: {lab.title}")
                     break
         
         # General recommendations
-        overall_progress = tracker.get_completion_percentage()
+        overall_progress = progress.completion_percentage()
         
         if overall_progress < 25:
             recommendations.append("💡 Focus on completing the Introduction and Domain 1 first")
@@ -200,64 +150,35 @@ def get_study_stats_tool() -> str:
         Detailed study statistics and analytics
     """
     try:
-        tracker = ProgressTracker()
+        progress = get_progress_repository().get(get_user_id())
         
         # Get completion data
-        completed_study = tracker.get_completed_sections("study_guide")
-        completed_labs = tracker.get_completed_sections("labs")
-        
-        # Calculate domain-specific progress
-        domain_progress = {}
-        for domain in ["domain1", "domain2", "domain3", "domain4"]:
-            domain_progress[domain] = {
-                "study_complete": domain in completed_study,
-                "labs_complete": []
-            }
-        
-        # Map labs to domains
-        lab_domain_mapping = {
-            "lab1_1": "domain1", "lab1_2": "domain1", "lab1_3": "domain1",
-            "lab3_1": "domain1", "lab3_2": "domain1", "lab3_3": "domain1",
-            "lab2_1": "domain2", "lab2_2": "domain2", "lab2_3": "domain2",
-            "lab4_1": "domain3", "lab4_2": "domain3", "lab4_3": "domain3",
-            "lab5_1": "domain4", "lab5_2": "domain4", "lab5_3": "domain4"
-        }
+        completed_study = progress.completed_sections("study_guide")
+        completed_labs = progress.completed_sections("labs")
         
-        for lab in completed_labs:
-            domain = lab_domain_mapping.get(lab)
-            if domain:
-                domain_progress[domain]["labs_complete"].append(lab)
+        catalog = get_catalog()
+        completed_lab_ids = set(completed_labs)
         
         # Generate stats
         stats = "**Detailed Study Statistics:**\n\n"
         
-        for domain, data in domain_progress.items():
-            domain_names = {
-                "domain1": "Data Ingestion and Transformation (30-35%)",
-                "domain2": "Storage and Data Management (30-35%)",
-                "domain3": "Data Security and Access Control (15-20%)",
-                "domain4": "Data Operations and Optimization (15-20%)"
-            }
+        for domain in catalog.domains:
+            domain_labs = catalog.labs_by_domain.get(domain.id, ())
+            labs_complete = [lab.id for lab in domain_labs if lab.id in completed_lab_ids]
+            study_status = "✅" if domain.id in completed_study else "⏳"
             
-            study_status = "✅" if data["study_complete"] else "⏳"
-            labs_count = len(data["labs_complete"])
-            total_labs = len([lab for lab, d in lab_domain_mapping.items() if d == domain])
-            
-            stats += f"**{domain_names[domain]}**\n"
+            stats += f"**{domain.title} ({domain.weight})**\n"
             stats += f"- Study Guide: {study_status}\n"
-            stats += f"- Labs Completed: {labs_count}/{total_labs}\n"
-            if data["labs_complete"]:
-                stats += f"- Completed Labs: {', '.join(data['labs_complete'])}\n"
+            stats += f"- Labs Completed: {len(labs_complete)}/{len(domain_labs)}\n"
+            if labs_complete:
+                stats += f"- Completed Labs: {', '.join(labs_complete)}\n"
             stats += "\n"
         
         # Overall stats
-        total_sections = 6  # intro + 4 domains + exam_tips
-        total_labs = 15
-        
         stats += f"**Overall Statistics:**\n"
-        stats += f"- Study Guide: {len(completed_study)}/{total_sections} sections\n"
-        stats += f"- Labs: {len(completed_labs)}/{total_labs} completed\n"
-        stats += f"- Total Progress: {tracker.get_completion_percentage():.1f}%\n"
+        stats += f"- Study Guide: {len(completed_study)}/{len(catalog.study_guide)} sections\n"
+        stats += f"- Labs: {len(completed_labs)}/{len(catalog.labs)} completed\n"
+        stats += f"- Total Progress: {progress.completion_percentage():.1f}%\n"
         
         return stats
         
@@ -4,55 +4,139 @@ Amazon Bedrock Client for AWS Data Engineer Course
 This module provides utilities for interacting with Amazon Bedrock and Claude models.
 """
 
+import asyncio
 import boto3
 import json
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncGenerator, Callable, Deque, Iterator, List, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
+from strands.models import BedrockModel
 import os
 
+from app.utils.rate_limiter import (
+    DEFAULT_OUTPUT_TOKENS, BedrockThrottlingError, SingleFlight, estimate_tokens, get_rate_limiter,
+    request_key
+)
+from app.config import (
+    BEDROCK_HEALTH_CHECK, BEDROCK_CACHE_TTL, BEDROCK_MAX_POOL_CONNECTIONS, BEDROCK_RETRY_MODE,
+    BEDROCK_MAX_ATTEMPTS, BEDROCK_CONNECT_TIMEOUT, BEDROCK_READ_TIMEOUT, BEDROCK_TCP_KEEPALIVE,
+    BEDROCK_MAX_CONCURRENCY
+)
+
+
+class BedrockAccessDeniedError(Exception):
+    """Raised when Bedrock denies access to a model."""
+
+
+def get_boto_config() -> Config:
+    """
+    Build the botocore configuration for Bedrock clients.
+    
+    The defaults (10 pooled connections, legacy retries) make concurrent
+    sessions queue for connections and surface throttling immediately, so the
+    pool size, retry mode, timeouts and keepalive come from app.config.
+    
+    Returns:
+        botocore Config instance
+    """
+    return Config(
+        max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+        retries={'mode': BEDROCK_RETRY_MODE, 'total_max_attempts': BEDROCK_MAX_ATTEMPTS},
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+        read_timeout=BEDROCK_READ_TIMEOUT,
+        tcp_keepalive=BEDROCK_TCP_KEEPALIVE
+    )
+
+
+class _TTLCache:
+    """Thread-safe cache of values that expire after a fixed number of seconds."""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, key: Any, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader on a miss; errors are not cached."""
+        with self._lock:
+            cached = self._values.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        value = loader()
+        self.set(key, value)
+        return value
+    
+    def set(self, key: Any, value: Any):
+        """Store a value for the cache's TTL."""
+        with self._lock:
+            self._values[key] = (time.monotonic() + self.ttl, value)
+
 
 class BedrockClient:
     """Client for interacting with Amazon Bedrock."""
     
-    def __init__(self, region: str = None, profile: str = None):
+    def __init__(self, region: str = None, profile: str = None,
+                 health_check: str = BEDROCK_HEALTH_CHECK, cache_ttl: float = BEDROCK_CACHE_TTL):
         """
         Initialize the Bedrock client.
         
         Args:
             region: AWS region (defaults to environment variable or us-west-2)
             profile: AWS profile name (defaults to environment variable or default)
+            health_check: "eager" to test the connection now, or "lazy" to test it
+                          only when test_connection or test_bedrock_connection is called
+            cache_ttl: Seconds to cache model listings and access checks
         """
         self.region = region or os.getenv('BEDROCK_REGION', 'us-west-2')
         self.profile = profile or os.getenv('AWS_PROFILE', 'default')
+        self._cache = _TTLCache(cache_ttl)
+        self._bedrock = None
+        self.config = get_boto_config()
+        # boto3 sessions are not thread-safe, so clients are created one at a time
+        self.session_lock = threading.Lock()
+        # Identical concurrent invocations share one upstream call
+        self._single_flight = SingleFlight()
         
         try:
             # Create session with profile if specified
             if self.profile != 'default':
-                session = boto3.Session(profile_name=self.profile)
-                self.bedrock_runtime = session.client(
-                    'bedrock-runtime',
-                    region_name=self.region
-                )
+                self.session = boto3.Session(profile_name=self.profile, region_name=self.region)
             else:
-                self.bedrock_runtime = boto3.client(
-                    'bedrock-runtime',
-                    region_name=self.region
-                )
-                
-            # Test the connection
-            self._test_connection()
+                self.session = boto3.Session(region_name=self.region)
+            
+            self.bedrock_runtime = self.session.client(
+                'bedrock-runtime',
+                region_name=self.region,
+                config=self.config
+            )
+            
+            if health_check == "eager":
+                self.test_connection()
             
         except NoCredentialsError:
             raise Exception("AWS credentials not found. Please configure your credentials.")
         except ClientError as e:
             raise Exception(f"Failed to initialize Bedrock client: {str(e)}")
     
-    def _test_connection(self):
-        """Test the Bedrock connection."""
+    @property
+    def bedrock(self):
+        """Bedrock control-plane client, created on first use and then reused."""
+        if self._bedrock is None:
+            with self.session_lock:
+                if self._bedrock is None:
+                    self._bedrock = self.session.client('bedrock', region_name=self.region, config=self.config)
+        return self._bedrock
+    
+    def test_connection(self):
+        """Test the Bedrock connection (the model listing it uses is cached)."""
         try:
             # Try to list foundation models to test connection
-            bedrock = boto3.client('bedrock', region_name=self.region)
-            bedrock.list_foundation_models()
+            self._list_foundation_models()
         except ClientError as e:
             if e.response['Error']['Code'] == 'UnauthorizedOperation':
                 raise Exception("Access denied to Bedrock. Please check your permissions.")
@@ -75,7 +159,21 @@ class BedrockClient:
             
         Returns:
             Claude's response text
+            
+        Raises:
+            BedrockThrottlingError: If Bedrock or the local rate limit throttles the request
         """
+        key = request_key(model_id, prompt, max_tokens, temperature)
+        return self._single_flight.do(
+            key, lambda: self._invoke_claude(prompt, model_id, max_tokens, temperature)
+        )
+    
+    def _invoke_claude(self, prompt: str, model_id: str, max_tokens: int, temperature: float) -> str:
+        """Invoke Claude once the model's rate limit allows it."""
+        limiter = get_rate_limiter(model_id)
+        reserved = limiter.acquire(estimate_tokens(prompt) + max_tokens)
+        used_tokens = None
+        
         try:
             # Prepare the request body
             body = {
@@ -100,6 +198,12 @@ class BedrockClient:
             # Parse the response
             response_body = json.loads(response['body'].read())
             
+            # A successful call proves access, so later access checks are free
+            self._cache.set(('model_access', model_id), True)
+            
+            usage = response_body.get('usage', {})
+            used_tokens = usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+            
             if 'content' in response_body and response_body['content']:
                 return response_body['content'][0]['text']
             else:
@@ -110,28 +214,123 @@ class BedrockClient:
             if error_code == 'ValidationException':
                 raise Exception(f"Invalid request to Bedrock: {str(e)}")
             elif error_code == 'AccessDeniedException':
-                raise Exception("Access denied to Claude model. Please check your permissions and model access.")
+                raise BedrockAccessDeniedError("Access denied to Claude model. Please check your permissions and model access.")
+            elif error_code == 'ThrottlingException':
+                raise BedrockThrottlingError("Bedrock is throttling requests to this model. Please try again shortly.")
+            else:
+                raise Exception(f"Bedrock API error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error invoking Claude: {str(e)}")
+        finally:
+            limiter.settle(reserved, used_tokens)
+    
+    def invoke_claude_stream(self,
+                             prompt: str,
+                             model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0",
+                             max_tokens: int = 4000,
+                             temperature: float = 0.1,
+                             system: Optional[str] = None) -> Iterator[str]:
+        """
+        Invoke Claude model with a prompt and stream the response text.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            model_id: The Claude model ID
+            max_tokens: Maximum tokens in response
+            temperature: Temperature for response generation
+            system: Optional system prompt
+            
+        Yields:
+            Text chunks of Claude's response as they are generated
+            
+        Raises:
+            BedrockThrottlingError: If Bedrock or the local rate limit throttles the request
+        """
+        limiter = get_rate_limiter(model_id)
+        reserved = limiter.acquire(estimate_tokens(prompt) + estimate_tokens(system or "") + max_tokens)
+        used_tokens = 0
+        
+        try:
+            # Prepare the request body
+            body = {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            }
+            if system:
+                body["system"] = system
+            
+            # Invoke the model with a streaming response
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=json.dumps(body),
+                contentType='application/json'
+            )
+            
+            # Yield text deltas as they arrive
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                
+                payload = json.loads(chunk['bytes'])
+                if payload.get('type') == 'content_block_delta':
+                    text = payload.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif payload.get('type') == 'message_start':
+                    used_tokens += payload.get('message', {}).get('usage', {}).get('input_tokens', 0)
+                elif payload.get('type') == 'message_delta':
+                    used_tokens += payload.get('usage', {}).get('output_tokens', 0)
+                
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'ValidationException':
+                raise Exception(f"Invalid request to Bedrock: {str(e)}")
+            elif error_code == 'AccessDeniedException':
+                raise BedrockAccessDeniedError("Access denied to Claude model. Please check your permissions and model access.")
+            elif error_code == 'ThrottlingException':
+                raise BedrockThrottlingError("Bedrock is throttling requests to this model. Please try again shortly.")
             else:
                 raise Exception(f"Bedrock API error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error invoking Claude: {str(e)}")
+        finally:
+            limiter.settle(reserved, used_tokens or None)
     
     def check_model_access(self, model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0") -> bool:
         """
         Check if the specified model is accessible.
         
+        Granted and denied access are cached, and any successful invocation of
+        the model counts as a positive check, so the test invocation rarely has
+        to run. Other failures (throttling, network errors) are not cached.
+        
         Args:
             model_id: The model ID to check
             
         Returns:
             True if model is accessible, False otherwise
         """
+        def invoke_test():
+            try:
+                # Try a simple test invocation
+                test_prompt = "Hello"
+                self.invoke_claude(test_prompt, model_id, max_tokens=10)
+                return True
+            except BedrockAccessDeniedError:
+                return False
+        
         try:
-            # Try a simple test invocation
-            test_prompt = "Hello"
-            self.invoke_claude(test_prompt, model_id, max_tokens=10)
-            return True
+            return self._cache.get_or_load(('model_access', model_id), invoke_test)
         except Exception:
+            # Says nothing about access, so check again next time
             return False
     
     def get_available_models(self) -> list:
@@ -142,8 +341,7 @@ class BedrockClient:
             List of available model information
         """
         try:
-            bedrock = boto3.client('bedrock', region_name=self.region)
-            response = bedrock.list_foundation_models()
+            response = self._list_foundation_models()
             
             # Filter for Claude models
             claude_models = []
@@ -159,16 +357,236 @@ class BedrockClient:
             
         except ClientError as e:
             raise Exception(f"Error listing models: {str(e)}")
+    
+    def _list_foundation_models(self) -> Dict[str, Any]:
+        """List foundation models, cached for the cache TTL."""
+        return self._cache.get_or_load('foundation_models', self.bedrock.list_foundation_models)
+
+
+_client = None
+_client_lock = threading.Lock()
 
 
 def get_bedrock_client() -> BedrockClient:
     """
-    Get a configured Bedrock client instance.
+    Get the process-wide Bedrock client instance.
     
     Returns:
         BedrockClient instance
     """
-    return BedrockClient()
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = BedrockClient()
+    return _client
+
+
+class RateLimitedBedrockModel(BedrockModel):
+    """Strands Bedrock model that waits for the model's client-side rate limit before each call."""
+    
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs) -> AsyncGenerator[Any, None]:
+        """Stream a model response once the rate limit allows it (see BedrockModel.stream)."""
+        limiter = get_rate_limiter(self.config['model_id'])
+        request_text = json.dumps([messages, tool_specs], default=str) + (system_prompt or "")
+        estimate = estimate_tokens(request_text) + (self.config.get('max_tokens') or DEFAULT_OUTPUT_TOKENS)
+        
+        # Waiting for capacity blocks, so keep it off the event loop
+        reserved = await asyncio.to_thread(limiter.acquire, estimate)
+        used_tokens = None
+        try:
+            async for event in super().stream(messages, tool_specs, system_prompt, **kwargs):
+                usage = event.get('metadata', {}).get('usage') if isinstance(event, dict) else None
+                if usage:
+                    used_tokens = usage.get('totalTokens')
+                yield event
+        finally:
+            limiter.settle(reserved, used_tokens)
+
+
+_models: Dict[str, BedrockModel] = {}
+_models_lock = threading.Lock()
+
+
+def get_bedrock_model(model_id: str) -> BedrockModel:
+    """
+    Get the Strands Bedrock model shared by all agents using a model ID.
+    
+    The model uses the same session, botocore configuration and per-model
+    rate limiter as the process-wide BedrockClient.
+    
+    Args:
+        model_id: The Claude model ID
+        
+    Returns:
+        BedrockModel instance
+    """
+    model = _models.get(model_id)
+    if model is None:
+        client = get_bedrock_client()
+        with _models_lock, client.session_lock:
+            model = _models.get(model_id)
+            if model is None:
+                model = _models[model_id] = RateLimitedBedrockModel(
+                    model_id=model_id,
+                    boto_session=client.session,
+                    boto_client_config=client.config
+                )
+    return model
+
+
+# Runs blocking boto3 calls for AsyncBedrockClient; sized to the HTTP connection pool.
+# Requests wait for a model slot on their event loop before they get a thread here.
+_async_executor = ThreadPoolExecutor(max_workers=BEDROCK_MAX_POOL_CONNECTIONS, thread_name_prefix="bedrock")
+
+
+class _ModelSlots:
+    """
+    Process-wide limit on in-flight requests to one model.
+    
+    asyncio.Semaphore belongs to a single event loop, and the app starts a
+    new loop per streamed answer, so waiters from every loop queue here and
+    are woken on their own loop. Waiting never blocks a thread.
+    """
+    
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._in_use = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+    
+    async def acquire(self):
+        """Wait for a free slot."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_use < self.limit and not self._waiters:
+                self._in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was already handed over; pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+    
+    def release(self):
+        """Free a slot, handing it to the longest waiter if there is one. Safe from any thread."""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._hand_over, future)
+                    return
+                except RuntimeError:
+                    # The waiter's loop is closed
+                    continue
+            self._in_use -= 1
+    
+    def _hand_over(self, future: asyncio.Future):
+        """Give the slot to a waiter, or pass it on if the waiter was cancelled meanwhile."""
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+_model_slots: Dict[str, _ModelSlots] = {}
+_model_slots_lock = threading.Lock()
+
+
+def _slots_for(model_id: str) -> _ModelSlots:
+    """Get the process-wide in-flight limit for a model, sized by BEDROCK_MAX_CONCURRENCY."""
+    with _model_slots_lock:
+        if model_id not in _model_slots:
+            _model_slots[model_id] = _ModelSlots(BEDROCK_MAX_CONCURRENCY)
+        return _model_slots[model_id]
+
+
+class AsyncBedrockClient:
+    """Asynchronous interface to Bedrock for callers running an event loop."""
+    
+    def __init__(self, client: Optional[BedrockClient] = None):
+        """
+        Initialize the async client.
+        
+        Args:
+            client: Synchronous client to delegate to (defaults to the process-wide client)
+        """
+        self.client = client or get_bedrock_client()
+    
+    async def invoke_claude(self,
+                            prompt: str,
+                            model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0",
+                            max_tokens: int = 4000,
+                            temperature: float = 0.1) -> str:
+        """
+        Invoke Claude model with a prompt without blocking the event loop.
+        
+        At most BEDROCK_MAX_CONCURRENCY requests per model are in flight
+        across the process; the rest wait on their event loop.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            model_id: The Claude model ID
+            max_tokens: Maximum tokens in response
+            temperature: Temperature for response generation
+            
+        Returns:
+            Claude's response text
+        """
+        slots = _slots_for(model_id)
+        await slots.acquire()
+        try:
+            call = _async_executor.submit(self.client.invoke_claude, prompt, model_id, max_tokens, temperature)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is held until the call really finishes, even if the caller stops waiting
+        call.add_done_callback(lambda _: slots.release())
+        return await asyncio.wrap_future(call)
+    
+    async def gather(self,
+                     prompts: List[str],
+                     model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0",
+                     max_tokens: int = 4000,
+                     temperature: float = 0.1,
+                     return_exceptions: bool = False) -> List[Any]:
+        """
+        Invoke Claude with several prompts concurrently.
+        
+        Args:
+            prompts: Prompts to send
+            model_id: The Claude model ID
+            max_tokens: Maximum tokens in each response
+            temperature: Temperature for response generation
+            return_exceptions: Return exceptions in place of failed responses
+                               instead of raising the first one
+            
+        Returns:
+            Responses in the same order as the prompts
+        """
+        return await asyncio.gather(
+            *(self.invoke_claude(prompt, model_id, max_tokens, temperature) for prompt in prompts),
+            return_exceptions=return_exceptions
+        )
+
+
+def get_async_bedrock_client() -> AsyncBedrockClient:
+    """
+    Get an async Bedrock client backed by the process-wide client.
+    
+    Returns:
+        AsyncBedrockClient instance
+    """
+    return AsyncBedrockClient()
 
 
 def test_bedrock_connection() -> Dict[str, Any]:
@@ -180,6 +598,7 @@ def test_bedrock_connection() -> Dict[str, Any]:
     """
     try:
         client = get_bedrock_client()
+        client.test_connection()
         
         # Test model access
         model_id = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
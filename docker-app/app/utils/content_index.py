@@ -0,0 +1,308 @@
+"""
+Inverted index over the study guide for the content tools.
+
+The index maps every term to the (file, line) positions it occurs at, so
+content lookups become index probes instead of scanning every markdown file;
+matching lines are served from the shared document store. It is built once per
+process and persisted to disk so container restarts can reuse it. When a file
+changes, only the postings of that file's terms are replaced, and the index
+is saved in the background a few seconds later.
+"""
+
+import fnmatch
+import glob
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.config import STUDY_GUIDE_PATH, CONTENT_INDEX_PATH
+from app.utils.document_store import get_document_store
+from app.utils.progress_store import DebouncedFlusher
+
+INDEX_VERSION = 2
+
+# Seconds after a file change before the index is saved; changes made
+# meanwhile are saved together
+SAVE_DELAY = 2.0
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms in order of appearance
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ContentIndex:
+    """Term -> (file, line) inverted index over the study guide markdown files."""
+
+    def __init__(self, content_path: str = STUDY_GUIDE_PATH, index_path: str = CONTENT_INDEX_PATH):
+        """
+        Initialize an empty index.
+
+        Args:
+            content_path: Directory containing the markdown files to index
+            index_path: Path of the persisted index file
+        """
+        self.content_path = content_path
+        self.index_path = index_path
+        self.postings: Dict[str, List[Tuple[str, int]]] = {}
+        self.fingerprint: Dict[str, List[float]] = {}
+        # Terms occurring in each file, so a file's postings can be replaced alone
+        self._file_terms: Dict[str, Set[str]] = {}
+        self._update_lock = threading.RLock()
+        self._saver: Optional[DebouncedFlusher] = None
+
+    def load_or_build(self) -> "ContentIndex":
+        """Load the persisted index if it matches the files on disk, otherwise rebuild it."""
+        if not self.load():
+            self.build()
+            self.save()
+        return self
+
+    def build(self):
+        """Read and index every markdown file under the content path."""
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        file_terms: Dict[str, Set[str]] = {}
+        fingerprint = self._current_fingerprint()
+
+        for file_name in sorted(fingerprint):
+            file_postings = self._file_postings(file_name)
+            file_terms[file_name] = set(file_postings)
+            for term, entries in file_postings.items():
+                postings.setdefault(term, []).extend(entries)
+
+        with self._update_lock:
+            self.postings = postings
+            self.fingerprint = fingerprint
+            self._file_terms = file_terms
+
+    def update_file(self, file_path: str):
+        """
+        Replace the postings of a single changed, created or deleted file.
+
+        Only the posting lists of terms the file had or has are touched, each
+        replaced by a new list, so concurrent lookups see every term either
+        before or after the change. The index is saved in the background.
+
+        Args:
+            file_path: Path of the markdown file that changed
+        """
+        if os.path.dirname(os.path.abspath(file_path)) != os.path.abspath(self.content_path):
+            return
+        file_name = os.path.basename(file_path)
+        if not file_name.endswith('.md'):
+            return
+
+        # Read before taking the lock: the document store may notify subscribers
+        # (including this method) while it reads the file
+        exists = os.path.exists(file_path)
+        file_postings = self._file_postings(file_name) if exists else {}
+
+        with self._update_lock:
+            for term in self._file_terms.pop(file_name, set()) - file_postings.keys():
+                kept = [entry for entry in self.postings.get(term, ()) if entry[0] != file_name]
+                if kept:
+                    self.postings[term] = kept
+                else:
+                    self.postings.pop(term, None)
+            for term, entries in file_postings.items():
+                kept = [entry for entry in self.postings.get(term, ()) if entry[0] != file_name]
+                self.postings[term] = kept + entries
+
+            fingerprint = {name: value for name, value in self.fingerprint.items() if name != file_name}
+            if exists:
+                stat = os.stat(file_path)
+                fingerprint[file_name] = [stat.st_mtime, stat.st_size]
+                self._file_terms[file_name] = set(file_postings)
+            self.fingerprint = fingerprint
+
+            if self._saver is None:
+                self._saver = DebouncedFlusher(self.save, SAVE_DELAY, name="content-index-saver")
+        self._saver.schedule()
+
+    def load(self) -> bool:
+        """
+        Load the index from disk.
+
+        Returns:
+            True if a current index was loaded, False if it is missing or stale
+        """
+        if not os.path.exists(self.index_path):
+            return False
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("version") != INDEX_VERSION or data.get("fingerprint") != self._current_fingerprint():
+            return False
+
+        postings = {
+            term: [tuple(posting) for posting in entries]
+            for term, entries in data["postings"].items()
+        }
+        file_terms: Dict[str, Set[str]] = {name: set() for name in data["fingerprint"]}
+        for term, entries in postings.items():
+            for file_name, _ in entries:
+                file_terms.setdefault(file_name, set()).add(term)
+
+        with self._update_lock:
+            self.fingerprint = data["fingerprint"]
+            self.postings = postings
+            self._file_terms = file_terms
+        return True
+
+    def save(self):
+        """Persist the index to disk, replacing any previous copy atomically."""
+        with self._update_lock:
+            payload = json.dumps({
+                "version": INDEX_VERSION,
+                "fingerprint": self.fingerprint,
+                "postings": self.postings
+            })
+
+        directory = os.path.dirname(self.index_path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # A read-only cache location only costs a rebuild on the next start
+            pass
+
+    def get_files(self, pattern: str = "*") -> List[str]:
+        """
+        List indexed file names matching a glob pattern.
+
+        Args:
+            pattern: Glob pattern matched against file names
+
+        Returns:
+            Sorted list of matching file names
+        """
+        return [name for name in sorted(self.fingerprint) if fnmatch.fnmatch(name, pattern)]
+
+    def flush(self):
+        """Save any file changes still waiting for the background save."""
+        if self._saver is not None:
+            self._saver.flush()
+
+    def get_lines(self, file_name: str) -> List[str]:
+        """Return the current lines of an indexed file from the document store."""
+        try:
+            return get_document_store().get_lines(os.path.join(self.content_path, file_name))
+        except FileNotFoundError:
+            return []
+
+    def find(self, query: str, files: Optional[List[str]] = None) -> Dict[str, List[int]]:
+        """
+        Find lines containing the query as a case-insensitive substring.
+
+        Args:
+            query: Text to search for
+            files: Optional list of file names to restrict the search to
+
+        Returns:
+            Mapping of file name to sorted matching line numbers
+        """
+        needle = query.lower()
+        allowed = set(files) if files is not None else set(self.fingerprint)
+        candidates = self._candidate_lines(needle)
+
+        matches: Dict[str, List[int]] = {}
+        file_lines: Dict[str, List[str]] = {}
+        for file_name, line_number in sorted(candidates):
+            if file_name not in allowed:
+                continue
+            if file_name not in file_lines:
+                file_lines[file_name] = self.get_lines(file_name)
+            lines = file_lines[file_name]
+            if line_number < len(lines) and needle in lines[line_number].lower():
+                matches.setdefault(file_name, []).append(line_number)
+        return matches
+
+    def _candidate_lines(self, needle: str) -> Set[Tuple[str, int]]:
+        """Intersect postings for the query terms to get a superset of matching lines."""
+        terms = tokenize(needle)
+        if not terms:
+            return {
+                (file_name, line_number)
+                for file_name in self.fingerprint
+                for line_number in range(len(self.get_lines(file_name)))
+            }
+
+        postings = self.postings
+        # Snapshot the terms: file updates add and remove them concurrently
+        all_terms = list(postings)
+        candidates = None
+        for position, term in enumerate(terms):
+            # The first and last query terms may be cut off mid-word
+            if len(terms) == 1:
+                vocabulary = [t for t in all_terms if term in t]
+            elif position == 0:
+                vocabulary = [t for t in all_terms if t.endswith(term)]
+            elif position == len(terms) - 1:
+                vocabulary = [t for t in all_terms if t.startswith(term)]
+            else:
+                vocabulary = [term]
+
+            lines = set()
+            for t in vocabulary:
+                lines.update(postings.get(t, ()))
+
+            candidates = lines if candidates is None else candidates & lines
+            if not candidates:
+                break
+
+        return candidates
+
+    def _file_postings(self, file_name: str) -> Dict[str, List[Tuple[str, int]]]:
+        """Index one file: term -> (file, line) entries for its lines."""
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        for line_number, line in enumerate(self.get_lines(file_name)):
+            for term in set(tokenize(line)):
+                postings.setdefault(term, []).append((file_name, line_number))
+        return postings
+
+    def _current_fingerprint(self) -> Dict[str, List[float]]:
+        """Return the modification time and size of every markdown file on disk."""
+        fingerprint = {}
+        for file_path in glob.glob(f"{self.content_path}/*.md"):
+            stat = os.stat(file_path)
+            fingerprint[os.path.basename(file_path)] = [stat.st_mtime, stat.st_size]
+        return fingerprint
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_content_index() -> ContentIndex:
+    """
+    Get the process-wide content index, loading or building it on first use.
+
+    Returns:
+        ContentIndex instance
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ContentIndex().load_or_build()
+                get_document_store().subscribe(_index.update_file)
+    return _index
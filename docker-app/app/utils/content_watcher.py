@@ -0,0 +1,174 @@
+"""
+Background watcher for the mounted content volume.
+
+docker-compose bind-mounts the study guide and labs into the container, so
+authors can edit content while the app is running. The watcher turns those
+edits into per-document invalidations on the shared document store, which in
+turn updates the content index, section ranker and embedding store for just
+the changed file.
+
+File system events come from watchdog (inotify on Linux) when it is installed;
+otherwise the watcher polls file modification times.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import STUDY_GUIDE_PATH, LABS_PATH, CONTENT_WATCHER, CONTENT_POLL_INTERVAL
+from app.utils.document_store import get_document_store
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _InvalidatingHandler(FileSystemEventHandler):
+    """
+    watchdog handler that forwards markdown file changes to the watcher.
+
+    Only events that change a file are forwarded. Open and close-without-write
+    events are ignored: the listeners re-read a file after each invalidation,
+    and forwarding those reads would invalidate the file again in a loop.
+    """
+
+    def __init__(self, watcher: "ContentWatcher"):
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self._forward(event)
+
+    def on_modified(self, event):
+        self._forward(event)
+
+    def on_deleted(self, event):
+        self._forward(event)
+
+    def on_moved(self, event):
+        self._forward(event)
+
+    def on_closed(self, event):
+        # Closed after writing; catches editors that write without a separate modify event
+        self._forward(event)
+
+    def _forward(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if path:
+                self.watcher.notify(path)
+
+
+class ContentWatcher:
+    """Invalidates cached content when markdown files under the content paths change."""
+
+    def __init__(self, paths: Optional[List[str]] = None, mode: str = CONTENT_WATCHER,
+                 poll_interval: float = CONTENT_POLL_INTERVAL):
+        """
+        Initialize the watcher.
+
+        Args:
+            paths: Content directories to watch (defaults to the study guide and labs)
+            mode: "auto" (inotify if available, else polling), "inotify" or "polling"
+            poll_interval: Seconds between scans in polling mode
+        """
+        self.paths = paths or [STUDY_GUIDE_PATH, LABS_PATH]
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._observer = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "ContentWatcher":
+        """Start watching in the background and let the document store trust its cache."""
+        paths = [path for path in self.paths if os.path.isdir(path)]
+
+        if self.mode in ("auto", "inotify") and Observer is not None:
+            self._observer = Observer()
+            handler = _InvalidatingHandler(self)
+            for path in paths:
+                self._observer.schedule(handler, path, recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+            self.backend = "inotify"
+        else:
+            # Take the baseline now so edits made right after start() are not missed
+            self._thread = threading.Thread(target=self._poll, args=(paths, self._snapshot(paths)),
+                                            name="content-watcher", daemon=True)
+            self._thread.start()
+            self.backend = "polling"
+
+        get_document_store().watched = True
+        return self
+
+    def stop(self):
+        """Stop watching; the document store falls back to checking mtimes on access."""
+        get_document_store().watched = False
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+
+    def notify(self, path: str):
+        """
+        Invalidate a changed markdown file.
+
+        Args:
+            path: Path reported by the file system (absolute or relative)
+        """
+        if not path.endswith('.md'):
+            return
+        # Store keys are relative to the working directory, like the configured content paths
+        get_document_store().invalidate(os.path.relpath(os.path.abspath(path)))
+
+    def _poll(self, paths: List[str], previous: Dict[str, Tuple[float, int]]):
+        """Compare file modification times every poll interval and report differences."""
+        while not self._stop.wait(self.poll_interval):
+            current = self._snapshot(paths)
+            for path in set(previous) | set(current):
+                if previous.get(path) != current.get(path):
+                    self.notify(path)
+            previous = current
+
+    @staticmethod
+    def _snapshot(paths: List[str]) -> Dict[str, Tuple[float, int]]:
+        """Return (mtime, size) for every markdown file under the paths."""
+        snapshot = {}
+        for root_path in paths:
+            for root, dirs, names in os.walk(root_path):
+                for name in names:
+                    if name.endswith('.md'):
+                        file_path = os.path.join(root, name)
+                        try:
+                            stat = os.stat(file_path)
+                        except FileNotFoundError:
+                            continue
+                        snapshot[file_path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def start_content_watcher() -> Optional[ContentWatcher]:
+    """
+    Start the process-wide content watcher if it is enabled and not yet running.
+
+    Returns:
+        The running ContentWatcher, or None when CONTENT_WATCHER is "off"
+    """
+    global _watcher
+    if CONTENT_WATCHER == "off":
+        return None
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = ContentWatcher().start()
+    return _watcher
@@ -0,0 +1,123 @@
+"""
+Token-budgeted conversation context for the assistant.
+
+Every routed specialist receives the conversation context with the question,
+so its size is paid once per agent. The context keeps the most recent
+messages whole, within a token budget. Older messages are folded into a short
+extractive summary with one line per message. Each line is cached by message
+content, so the rolling summary only does new work for messages that have
+just aged out of the recent window. A latest message too long for the budget
+(a long multi-agent answer) is cut to half of it, and room is always kept for
+a summary line of the turn before it.
+
+Token counts are approximated locally (about four characters per token).
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from app.config import CONTEXT_TOKEN_BUDGET, CONTEXT_RECENT_MESSAGES
+from app.utils.rate_limiter import estimate_tokens
+
+# Longest summary line kept for one older message
+SUMMARY_LINE_TOKENS = 40
+
+# Share of the budget kept for a latest message that does not fit on its own
+OVERSIZED_MESSAGE_SHARE = 0.5
+
+SUMMARY_HEADER = "Earlier in the conversation:"
+
+_MARKDOWN = re.compile(r"[#*_`>|]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def build_context(messages: List[Dict[str, str]], max_tokens: int = CONTEXT_TOKEN_BUDGET,
+                  recent_messages: int = CONTEXT_RECENT_MESSAGES) -> str:
+    """
+    Build conversation context that fits a token budget.
+
+    Args:
+        messages: Chat history as {"role", "content"} dicts, oldest first
+        max_tokens: Approximate token budget for the whole context
+        recent_messages: Maximum number of most recent messages kept whole
+                         (0 summarizes every message)
+
+    Returns:
+        Formatted conversation context
+    """
+    if not messages:
+        return ""
+
+    # Room for the summary header and at least one line, so the message before
+    # the whole ones (usually the question the latest answer replies to) survives
+    reserve = 0
+    if len(messages) > 1:
+        reserve = min(estimate_tokens(SUMMARY_HEADER) + estimate_tokens("- User asked: ") + SUMMARY_LINE_TOKENS,
+                      max_tokens // 2)
+
+    # Most recent messages whole, newest first, while they fit
+    recent: List[str] = []
+    used = 0
+    window = messages[-recent_messages:] if recent_messages > 0 else []
+    for message in reversed(window):
+        text = f"{message['role'].title()}: {message['content']}"
+        tokens = estimate_tokens(text)
+        if used + tokens > max_tokens - reserve:
+            if recent:
+                break
+            # The latest message alone is over budget; keep its beginning and
+            # leave the rest of the budget for the turns before it
+            text = _truncate(text, int(max_tokens * OVERSIZED_MESSAGE_SHARE))
+            tokens = estimate_tokens(text)
+        recent.append(text)
+        used += tokens
+    recent.reverse()
+
+    # Everything older than the whole messages is summarized, newest lines kept first
+    older = messages[:len(messages) - len(recent)]
+    summary: List[str] = []
+    header_tokens = estimate_tokens(SUMMARY_HEADER)
+    for message in reversed(older):
+        line = f"- {summarize_message(message['role'], message['content'])}"
+        tokens = estimate_tokens(line)
+        if used + header_tokens + tokens > max_tokens:
+            break
+        summary.append(line)
+        used += tokens
+    summary.reverse()
+
+    parts = []
+    if summary:
+        parts.append(SUMMARY_HEADER + "\n" + "\n".join(summary))
+    if recent:
+        parts.append("\n".join(recent))
+    return "\n\n".join(parts)
+
+
+@lru_cache(maxsize=2048)
+def summarize_message(role: str, content: str) -> str:
+    """
+    Summarize one message as a single short line.
+
+    Args:
+        role: "user" or "assistant"
+        content: Message text (markdown)
+
+    Returns:
+        The message's first sentence, without markdown and truncated
+    """
+    # Headings restate the topic; the first sentence of prose says more
+    lines = [line for line in content.splitlines() if not line.lstrip().startswith('#')]
+    text = " ".join(_MARKDOWN.sub("", "\n".join(lines) or content).split())
+    first_sentence = _SENTENCE_END.split(text, maxsplit=1)[0]
+    label = "User asked" if role == "user" else "Assistant"
+    return f"{label}: {_truncate(first_sentence, SUMMARY_LINE_TOKENS)}"
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, marking the cut with an ellipsis."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 1].rstrip() + "…"
@@ -0,0 +1,249 @@
+"""
+In-process store of parsed markdown documents.
+
+Each content file is read and parsed once into a heading tree; the content
+tools, the ranked retrieval engine and the Streamlit pages all serve whole
+documents, individual sections and line snippets from the same parsed copy.
+A document is re-parsed when its modification time or size changes, so edits
+to the mounted content volume are picked up without a restart. When a content
+watcher is running the per-access stat is skipped and the watcher invalidates
+changed documents instead. Derived caches (the content index, section ranker
+and embedding store) subscribe to invalidations to update just that document.
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass
+class Section:
+    """
+    A heading and everything below it up to the next heading of the same or higher level.
+
+    Offsets are byte offsets into the UTF-8 encoded document: the section spans
+    [start, end) including its subsections, and its own body (before the
+    first subsection) spans [start, body_end).
+    """
+    title: str
+    level: int
+    path: str
+    start: int
+    body_end: int
+    end: int
+    text: str
+    children: List["Section"] = field(default_factory=list)
+
+
+@dataclass
+class Document:
+    """A parsed markdown file."""
+    file_path: str
+    mtime: float
+    size: int
+    raw: bytes
+    text: str
+    lines: List[str]
+    sections: List[Section]
+
+    def walk(self) -> Iterator[Section]:
+        """Yield every section in document order."""
+        stack = list(reversed(self.sections))
+        while stack:
+            section = stack.pop()
+            yield section
+            stack.extend(reversed(section.children))
+
+    def full_text(self, section: Section) -> str:
+        """Return the text of a section including its subsections."""
+        return self.raw[section.start:section.end].decode('utf-8').strip()
+
+    def find_section(self, title: str) -> Optional[Section]:
+        """
+        Find a section by heading.
+
+        Args:
+            title: Heading text or heading path (e.g. "AWS Glue > Crawlers"), case-insensitive
+
+        Returns:
+            The first matching section, or None
+        """
+        wanted = title.strip().lower()
+        for section in self.walk():
+            if section.title.lower() == wanted or section.path.lower() == wanted:
+                return section
+        for section in self.walk():
+            if wanted in section.title.lower():
+                return section
+        return None
+
+
+def parse_document(raw: bytes) -> Tuple[str, List[str], List[Section]]:
+    """
+    Parse markdown into lines and a heading tree.
+
+    Headings inside fenced code blocks are ignored. Text before the first
+    heading becomes an untitled level-0 section.
+
+    Args:
+        raw: UTF-8 encoded markdown
+
+    Returns:
+        Tuple of (text, lines, top-level sections)
+    """
+    text = raw.decode('utf-8')
+    lines = text.split('\n')
+
+    # Collect (level, title, byte offset) for every heading
+    headings = []
+    offset = 0
+    in_fence = False
+    for line in lines:
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            headings.append((len(match.group(1)), match.group(2), offset))
+        offset += len(line.encode('utf-8')) + 1
+    total = len(raw)
+
+    roots: List[Section] = []
+    stack: List[Section] = []
+
+    if not headings or headings[0][2] > 0:
+        preamble_end = headings[0][2] if headings else total
+        preamble = raw[:preamble_end].decode('utf-8').strip()
+        if preamble:
+            roots.append(Section("", 0, "", 0, preamble_end, preamble_end, preamble))
+
+    for position, (level, title, start) in enumerate(headings):
+        body_end = headings[position + 1][2] if position + 1 < len(headings) else total
+
+        while stack and stack[-1].level >= level:
+            stack.pop()
+
+        path = " > ".join([parent.title for parent in stack] + [title])
+        section = Section(title, level, path, start, body_end, body_end,
+                          raw[start:body_end].decode('utf-8').strip())
+
+        if stack:
+            stack[-1].children.append(section)
+        else:
+            roots.append(section)
+        stack.append(section)
+
+        # Every open ancestor now extends at least to the end of this section
+        for ancestor in stack:
+            ancestor.end = body_end
+
+    return text, lines, roots
+
+
+class DocumentStore:
+    """Thread-safe cache of parsed documents with mtime-based invalidation."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._documents: Dict[str, Document] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+        # Set by the content watcher: cached documents are trusted until invalidated
+        self.watched = False
+
+    def get(self, file_path: str) -> Document:
+        """
+        Get a parsed document, re-reading it only if it changed on disk.
+
+        Args:
+            file_path: Path of the markdown file
+
+        Returns:
+            Parsed Document
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        file_path = os.path.normpath(file_path)
+        cached = self._documents.get(file_path)
+        if cached and self.watched:
+            return cached
+
+        stat = os.stat(file_path)
+        if cached and cached.mtime == stat.st_mtime and cached.size == stat.st_size:
+            return cached
+
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        text, lines, sections = parse_document(raw)
+        document = Document(file_path, stat.st_mtime, stat.st_size, raw, text, lines, sections)
+
+        with self._lock:
+            self._documents[file_path] = document
+
+        if cached:
+            self._notify(file_path)
+        return document
+
+    def get_text(self, file_path: str) -> str:
+        """Return the full text of a document."""
+        return self.get(file_path).text
+
+    def get_lines(self, file_path: str) -> List[str]:
+        """Return the lines of a document."""
+        return self.get(file_path).lines
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """
+        Drop cached documents so they are re-read on next access, and notify subscribers.
+
+        Args:
+            file_path: Changed, created or deleted document, or None to drop everything
+        """
+        with self._lock:
+            if file_path is None:
+                changed = list(self._documents)
+                self._documents.clear()
+            else:
+                file_path = os.path.normpath(file_path)
+                self._documents.pop(file_path, None)
+                changed = [file_path]
+
+        for path in changed:
+            self._notify(path)
+
+    def subscribe(self, listener: Callable[[str], None]):
+        """
+        Register a callback invoked with the path of every changed document.
+
+        Args:
+            listener: Callable taking the normalized file path
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, file_path: str):
+        """Call every subscriber for a changed document."""
+        for listener in list(self._listeners):
+            try:
+                listener(file_path)
+            except Exception:
+                # A failing derived cache must not break reads of the document itself
+                pass
+
+
+_store = DocumentStore()
+
+
+def get_document_store() -> DocumentStore:
+    """
+    Get the process-wide document store.
+
+    Returns:
+        DocumentStore instance
+    """
+    return _store
@@ -0,0 +1,331 @@
+"""
+Embedding search over study guide and lab chunks.
+
+Chunks of the course content are embedded offline into a single float32 NumPy
+matrix (one row per chunk) with a side metadata array. At query time the
+matrix is memory-mapped and searched with one matrix-vector product plus
+argpartition for the top-k rows.
+
+Build the store ahead of time with:
+
+    python -m app.utils.embedding_store
+
+The embedding function is pluggable through the EMBEDDING_BACKEND setting:
+"hashing" selects the local deterministic HashingEmbedder (no network), and
+"module:attribute" loads any callable that maps a list of texts to a
+(n, dimensions) array.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from app.config import EMBEDDING_BACKEND, EMBEDDING_STORE_PATH
+from app.utils.content_index import tokenize
+from app.utils.document_store import get_document_store
+from app.utils.section_ranker import STOPWORDS, RankedSection, get_section_ranker
+
+MATRIX_FILE = "matrix.npy"
+METADATA_FILE = "metadata.json"
+CHUNK_CHARS = 1500
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder using the hashing trick."""
+
+    def __init__(self, dimensions: int = 1024):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions: Length of the produced vectors
+        """
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            L2-normalized float32 array of shape (len(texts), dimensions)
+        """
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            terms = [self._stem(term) for term in tokenize(text) if term not in STOPWORDS]
+            features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+                value = int.from_bytes(digest, 'little')
+                sign = 1.0 if value & 1 else -1.0
+                matrix[row, (value >> 1) % self.dimensions] += sign
+
+        # Sublinear term weighting, then unit length so dot product is cosine similarity
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    @staticmethod
+    def _stem(term: str) -> str:
+        """Fold simple plurals so "files" and "file" share a feature."""
+        if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+            return term[:-1]
+        return term
+
+
+def get_embedder(backend: str = EMBEDDING_BACKEND) -> Embedder:
+    """
+    Resolve the configured embedding function.
+
+    Args:
+        backend: "hashing" or a "module:attribute" path to an embedder callable
+                 (or a zero-argument factory returning one)
+
+    Returns:
+        Embedding callable
+    """
+    if backend == "hashing":
+        return HashingEmbedder()
+
+    module_name, _, attribute = backend.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    embedder = getattr(importlib.import_module(module_name), attribute)
+    if isinstance(embedder, type):
+        embedder = embedder()
+    if not hasattr(embedder, "name"):
+        embedder.name = backend
+    return embedder
+
+
+def chunk_content(max_chars: int = CHUNK_CHARS) -> List[Dict[str, Any]]:
+    """
+    Split the study guide and labs into chunks for embedding.
+
+    Args:
+        max_chars: Target maximum chunk length in characters
+
+    Returns:
+        List of chunk metadata dicts with source, title, domain and text
+    """
+    return chunk_sections(get_section_ranker().sections, max_chars)
+
+
+def chunk_sections(sections: List[RankedSection], max_chars: int = CHUNK_CHARS) -> List[Dict[str, Any]]:
+    """
+    Split sections into chunks for embedding.
+
+    Each heading-delimited section is one chunk; long sections are split
+    further on paragraph boundaries.
+
+    Args:
+        sections: Sections to chunk
+        max_chars: Target maximum chunk length in characters
+
+    Returns:
+        List of chunk metadata dicts with source, title, domain and text
+    """
+    chunks = []
+    for section in sections:
+        current = ""
+        for paragraph in section.text.split('\n\n'):
+            if current and len(current) + len(paragraph) > max_chars:
+                chunks.append({"source": section.source, "title": section.title,
+                               "domain": section.domain, "text": current})
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current.strip():
+            chunks.append({"source": section.source, "title": section.title,
+                           "domain": section.domain, "text": current})
+    return chunks
+
+
+class EmbeddingStore:
+    """Chunk embeddings stored as one float32 matrix plus aligned metadata."""
+
+    def __init__(self, matrix: np.ndarray, metadata: List[Dict[str, Any]], embedder: Embedder,
+                 path: str = EMBEDDING_STORE_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            matrix: (chunks, dimensions) float32 matrix of unit-length embeddings
+            metadata: Chunk metadata, one entry per matrix row
+            embedder: Embedding function used to build the matrix
+            path: Directory the store is saved in
+        """
+        self.matrix = matrix
+        self.metadata = metadata
+        self.embedder = embedder
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, embedder: Embedder, path: str = EMBEDDING_STORE_PATH) -> "EmbeddingStore":
+        """
+        Chunk and embed the course content and save the store to disk.
+
+        Args:
+            embedder: Embedding function to use
+            path: Directory to write the matrix and metadata to
+
+        Returns:
+            The store, memory-mapped from the written files
+        """
+        fingerprint = content_fingerprint()
+        chunks = chunk_content()
+        matrix = np.asarray(embedder([chunk["text"] for chunk in chunks]), dtype=np.float32)
+        _save(path, matrix, chunks, embedder.name, fingerprint)
+        return cls.load(embedder, path)
+
+    @classmethod
+    def load(cls, embedder: Embedder, path: str = EMBEDDING_STORE_PATH) -> "EmbeddingStore":
+        """
+        Memory-map a previously built store.
+
+        Args:
+            embedder: Embedding function for queries; must match the one used to build
+            path: Directory containing the matrix and metadata
+
+        Returns:
+            EmbeddingStore instance
+
+        Raises:
+            ValueError: If the store was built with another embedder or from other content
+        """
+        with open(os.path.join(path, METADATA_FILE), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data["embedder"] != embedder.name:
+            raise ValueError(f"Store was built with '{data['embedder']}', not '{embedder.name}'")
+        if data.get("fingerprint") != content_fingerprint():
+            raise ValueError("Store was built from different content")
+
+        matrix = np.load(os.path.join(path, MATRIX_FILE), mmap_mode='r')
+        return cls(matrix, data["chunks"], embedder, path)
+
+    def update_file(self, file_path: str):
+        """
+        Re-embed the chunks of a single changed, created or deleted content file.
+
+        Rows of other files are kept as they are; the updated store is saved
+        and memory-mapped again.
+
+        Args:
+            file_path: Path of the content file that changed
+        """
+        ranker = get_section_ranker()
+        if not file_path.endswith('.md') or not ranker.is_content_file(file_path):
+            return
+
+        source = ranker.source_for(file_path)
+        chunks = chunk_sections(ranker.read_sections(file_path))
+
+        with self._lock:
+            keep = [row for row, chunk in enumerate(self.metadata) if chunk["source"] != source]
+            rows = [np.asarray(self.matrix[keep], dtype=np.float32)]
+            if chunks:
+                rows.append(np.asarray(self.embedder([chunk["text"] for chunk in chunks]), dtype=np.float32))
+
+            metadata = [self.metadata[row] for row in keep] + chunks
+            _save(self.path, np.vstack(rows), metadata, self.embedder.name, content_fingerprint())
+            self.matrix = np.load(os.path.join(self.path, MATRIX_FILE), mmap_mode='r')
+            self.metadata = metadata
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the chunks most similar to a query.
+
+        Args:
+            query: Free-text query
+            top_k: Number of chunks to return
+
+        Returns:
+            Chunk metadata dicts with an added "score", best first
+        """
+        with self._lock:
+            matrix, metadata = self.matrix, self.metadata
+        if not metadata:
+            return []
+
+        vector = np.asarray(self.embedder([query]), dtype=np.float32)[0]
+        scores = matrix @ vector
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [dict(metadata[i], score=float(scores[i])) for i in top if scores[i] > 0]
+
+
+def content_fingerprint() -> Dict[str, List[float]]:
+    """
+    Fingerprint the course content the store is built from.
+
+    Returns:
+        [mtime, size] for every study guide and lab markdown file, by source path
+    """
+    ranker = get_section_ranker()
+    fingerprint = {}
+    for file_path in ranker.content_files():
+        stat = os.stat(file_path)
+        fingerprint[ranker.source_for(file_path)] = [stat.st_mtime, stat.st_size]
+    return fingerprint
+
+
+def _save(path: str, matrix: np.ndarray, chunks: List[Dict[str, Any]], embedder_name: str,
+          fingerprint: Dict[str, List[float]]):
+    """Write the matrix and metadata, replacing any previous files atomically."""
+    os.makedirs(path, exist_ok=True)
+
+    matrix_path = os.path.join(path, MATRIX_FILE)
+    with open(f"{matrix_path}.tmp", 'wb') as f:
+        np.save(f, matrix)
+    os.replace(f"{matrix_path}.tmp", matrix_path)
+
+    metadata_path = os.path.join(path, METADATA_FILE)
+    with open(f"{metadata_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({"embedder": embedder_name, "fingerprint": fingerprint, "chunks": chunks}, f)
+    os.replace(f"{metadata_path}.tmp", metadata_path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """
+    Get the process-wide embedding store, building it if it is missing or stale.
+
+    Returns:
+        EmbeddingStore instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                embedder = get_embedder()
+                try:
+                    _store = EmbeddingStore.load(embedder)
+                except (OSError, ValueError, KeyError):
+                    _store = EmbeddingStore.build(embedder)
+                get_document_store().subscribe(_store.update_file)
+    return _store
+
+
+if __name__ == "__main__":
+    store = EmbeddingStore.build(get_embedder())
+    print(f"Embedded {len(store.metadata)} chunks into {EMBEDDING_STORE_PATH} "
+          f"({store.matrix.shape[1]} dimensions)")
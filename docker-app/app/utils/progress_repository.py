@@ -0,0 +1,320 @@
+"""
+In-memory progress model and repository.
+
+ProgressModel holds one learner's progress and answers the questions the UI
+and the progress tools ask (is a section complete, which sections are done,
+completion percentage, last visited section). It does not touch Streamlit,
+so agent tools running on worker threads can use it as safely as the
+Streamlit script can.
+
+ProgressRepository keeps one model per learner, loaded from the progress
+store on first use and reloaded once it is PROGRESS_RELOAD_INTERVAL seconds
+old, so changes other processes make to a shared store show up. Changes are
+written through to the store while the model is locked, so the store sees
+them in the order they were applied. Every session and tool call for a
+learner shares the same model.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import PROGRESS_RELOAD_INTERVAL
+from app.utils.progress_store import (
+    SECTION_TYPES, JsonProgressStore, ProgressStore, empty_progress, get_progress_store
+)
+
+
+class ProgressModel:
+    """
+    One learner's progress, safe to share between threads.
+
+    Complete and total counts per section type and the most recently changed
+    section are kept up to date on every change, so the completion
+    percentages and last visited section shown on every page render are
+    constant-time reads.
+    """
+
+    def __init__(self, document: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the model.
+
+        Args:
+            document: Progress document to start from (empty if omitted)
+        """
+        self._lock = threading.RLock()
+        self._load(document or empty_progress())
+
+    def set_section(self, section_type: str, section_id: str, complete: bool, timestamp: str):
+        """
+        Record a section's completion state.
+
+        Args:
+            section_type: Type of section ('study_guide' or 'labs')
+            section_id: ID of the section
+            complete: Whether the section is complete
+            timestamp: ISO timestamp of the change
+        """
+        changed_at = datetime.fromisoformat(timestamp)
+        with self._lock:
+            sections = self._document.setdefault(section_type, {})
+            counts = self._counts.setdefault(section_type, [0, 0])
+            previous = sections.get(section_id)
+            if previous is None:
+                counts[1] += 1
+            elif previous.get("complete", False):
+                counts[0] -= 1
+            if complete:
+                counts[0] += 1
+
+            sections[section_id] = {
+                "complete": complete,
+                "timestamp": timestamp
+            }
+            self._document["last_updated"] = timestamp
+
+            if self._last is None or changed_at >= self._last[0]:
+                self._last = (changed_at, section_type, section_id)
+            elif self._last[1:] == (section_type, section_id):
+                # The latest section moved back in time; find the new latest
+                self._last = self._find_last()
+
+    def reset(self):
+        """Clear all progress."""
+        with self._lock:
+            self._load(empty_progress())
+
+    def reload(self, document: Dict[str, Any]):
+        """
+        Replace the progress with a document loaded from the store.
+
+        Args:
+            document: Progress document
+        """
+        with self._lock:
+            self._load(document)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock held while the model changes."""
+        return self._lock
+
+    def is_complete(self, section_type: str, section_id: str) -> bool:
+        """
+        Check if a section is marked as complete.
+
+        Args:
+            section_type: Type of section ('study_guide' or 'labs')
+            section_id: ID of the section
+
+        Returns:
+            True if the section is complete
+        """
+        with self._lock:
+            return self._document.get(section_type, {}).get(section_id, {}).get("complete", False)
+
+    def completed_sections(self, section_type: str) -> List[str]:
+        """
+        Get the sections of a type that are marked as complete.
+
+        Args:
+            section_type: Type of section ('study_guide' or 'labs')
+
+        Returns:
+            IDs of the completed sections
+        """
+        with self._lock:
+            sections = self._document.get(section_type, {})
+            return [section_id for section_id, data in sections.items() if data.get("complete", False)]
+
+    def completion_percentage(self, section_type: Optional[str] = None) -> float:
+        """
+        Get the percentage of tracked sections that are complete.
+
+        Args:
+            section_type: Type of section, or None for all sections
+
+        Returns:
+            Percentage of sections that are complete (0-100)
+        """
+        with self._lock:
+            if section_type:
+                complete, total = self._counts.get(section_type, (0, 0))
+            else:
+                complete = sum(self._counts.get(s_type, (0, 0))[0] for s_type in SECTION_TYPES)
+                total = sum(self._counts.get(s_type, (0, 0))[1] for s_type in SECTION_TYPES)
+            if not total:
+                return 0
+            return (complete / total) * 100
+
+    def last_visited(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the most recently changed section.
+
+        Returns:
+            (section_type, section_id), or (None, None) if nothing was recorded
+        """
+        with self._lock:
+            return self._last[1:] if self._last else (None, None)
+
+    def last_updated(self) -> Optional[str]:
+        """Return the ISO timestamp of the last change."""
+        with self._lock:
+            return self._document.get("last_updated")
+
+    def to_document(self) -> Dict[str, Any]:
+        """Return a copy of the progress document."""
+        with self._lock:
+            return copy.deepcopy(self._document)
+
+    def _load(self, document: Dict[str, Any]):
+        """Replace the document and rebuild the counters and latest section from it."""
+        self._document = document
+        self._counts: Dict[str, List[int]] = {}
+        for section_type in SECTION_TYPES:
+            sections = self._document.setdefault(section_type, {})
+            complete = sum(1 for data in sections.values() if data.get("complete", False))
+            self._counts[section_type] = [complete, len(sections)]
+        self._last = self._find_last()
+
+    def _find_last(self) -> Optional[Tuple[datetime, str, str]]:
+        """Scan for the most recently changed section."""
+        last = None
+        for section_type in SECTION_TYPES:
+            for section_id, data in self._document.get(section_type, {}).items():
+                if "timestamp" in data:
+                    timestamp = datetime.fromisoformat(data["timestamp"])
+                    if last is None or timestamp > last[0]:
+                        last = (timestamp, section_type, section_id)
+        return last
+
+
+class ProgressRepository:
+    """Per-learner progress models, loaded once and written through to a store."""
+
+    def __init__(self, store: Optional[ProgressStore] = None, max_users: int = 1024,
+                 reload_interval: float = PROGRESS_RELOAD_INTERVAL):
+        """
+        Initialize the repository.
+
+        Args:
+            store: Storage backend, or None to keep progress in memory only
+            max_users: Number of learners' models kept in memory
+            reload_interval: Seconds before a model is reloaded from the store
+        """
+        self.store = store
+        self.max_users = max_users
+        self.reload_interval = reload_interval
+        # user_id -> [model, monotonic time it was loaded]
+        self._models: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> ProgressModel:
+        """
+        Get a learner's progress model, loading it on first use.
+
+        Args:
+            user_id: Learner identity
+
+        Returns:
+            ProgressModel shared by every caller for this learner
+        """
+        with self._lock:
+            entry = self._models.get(user_id)
+            if entry is not None:
+                self._models.move_to_end(user_id)
+
+        if entry is not None:
+            model, loaded_at = entry
+            if self.store is not None and time.monotonic() - loaded_at >= self.reload_interval:
+                entry[1] = time.monotonic()
+                # Under the model's lock, so a change cannot land between the read and the reload
+                with model.lock:
+                    model.reload(self.store.load(user_id))
+            return model
+
+        # Load outside the repository lock so one slow read does not block other learners
+        model = ProgressModel(self.store.load(user_id) if self.store is not None else None)
+        with self._lock:
+            entry = self._models.setdefault(user_id, [model, time.monotonic()])
+            self._models.move_to_end(user_id)
+            while len(self._models) > self.max_users:
+                self._models.popitem(last=False)
+        return entry[0]
+
+    def mark_complete(self, user_id: str, section_type: str, section_id: str, status: bool = True):
+        """
+        Mark a section as complete or incomplete and save the change.
+
+        Args:
+            user_id: Learner identity
+            section_type: Type of section ('study_guide' or 'labs')
+            section_id: ID of the section
+            status: Whether the section is complete
+        """
+        model = self.get(user_id)
+        with model.lock:
+            timestamp = datetime.now().isoformat()
+            model.set_section(section_type, section_id, status, timestamp)
+            if self.store is not None:
+                self.store.save_section(user_id, section_type, section_id, status, timestamp)
+
+    def reset(self, user_id: str):
+        """
+        Clear a learner's progress and save the change.
+
+        Args:
+            user_id: Learner identity
+        """
+        model = self.get(user_id)
+        with model.lock:
+            model.reset()
+            if self.store is not None:
+                self.store.reset(user_id)
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_progress_repository() -> ProgressRepository:
+    """
+    Get the process-wide progress repository backed by the configured store.
+
+    Returns:
+        ProgressRepository instance
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = ProgressRepository(get_progress_store())
+    return _repository
+
+
+_file_repositories: Dict[str, ProgressRepository] = {}
+_file_repositories_lock = threading.Lock()
+
+
+def get_file_progress_repository(path: str) -> ProgressRepository:
+    """
+    Get the process-wide progress repository backed by a JSON file.
+
+    Every caller using the same file shares one store, so the file has a
+    single writer and flusher.
+
+    Args:
+        path: Path of the JSON progress file
+
+    Returns:
+        ProgressRepository instance
+    """
+    path = os.path.abspath(path)
+    with _file_repositories_lock:
+        if path not in _file_repositories:
+            _file_repositories[path] = ProgressRepository(JsonProgressStore(path))
+        return _file_repositories[path]
@@ -0,0 +1,648 @@
+"""
+Storage backends for learner progress.
+
+A progress document has the shape the app has always used:
+
+    {"study_guide": {section_id: {"complete": bool, "timestamp": iso}},
+     "labs": {...},
+     "last_updated": iso}
+
+Backends load a user's document and apply single-section changes, so a
+completion click writes one entry instead of the whole document.
+PROGRESS_STORE selects the backend:
+"json" keeps everything in the progress.json file at PROGRESS_PATH: the default
+user's progress in the original format at the top level, other users' under
+a "users" key. "sharded" keeps one JSON
+file per user under PROGRESS_SHARD_DIR. "sqlite" keeps one row per user and
+section in a database at PROGRESS_DB_PATH, which every Streamlit worker
+process on the host can share. "journal" appends each change to a JSON-lines
+log at PROGRESS_JOURNAL_PATH and periodically compacts it into a snapshot.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.config import (
+    PROGRESS_STORE, PROGRESS_PATH, PROGRESS_DB_PATH, PROGRESS_JOURNAL_PATH, PROGRESS_COMPACT_EVENTS,
+    PROGRESS_FLUSH_INTERVAL, PROGRESS_SHARD_DIR
+)
+
+SECTION_TYPES = ("study_guide", "labs")
+
+DEFAULT_USER = "default"
+
+
+def empty_progress() -> Dict[str, Any]:
+    """Return a progress document with nothing completed."""
+    return {
+        "study_guide": {},
+        "labs": {},
+        "last_updated": datetime.now().isoformat()
+    }
+
+
+def write_json_atomic(path: str, data: Any, indent: Optional[int] = None):
+    """
+    Write JSON so readers see either the old file or the complete new one.
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+        indent: Indentation passed to json.dump (None writes compact JSON)
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, separators=None if indent else (',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class DebouncedFlusher:
+    """
+    Background thread that runs a write at most once per interval.
+
+    Callers mark the data dirty with `schedule()` and return immediately. The
+    first change after a write starts the interval; changes made during it are
+    covered by the same write. Pending changes are written when the process
+    exits.
+    """
+
+    def __init__(self, write: Callable[[], None], interval: float, name: str = "progress-flusher"):
+        """
+        Start the flusher thread.
+
+        Args:
+            write: Function that persists the current state
+            interval: Seconds to wait after a change before writing
+            name: Name of the flusher thread
+        """
+        self.interval = interval
+        self.last_error: Optional[Exception] = None
+        self._write = write
+        self._pending = False
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def schedule(self):
+        """Mark the data as changed."""
+        self._pending = True
+        self._wake.set()
+
+    def flush(self):
+        """Write now if there are unwritten changes."""
+        with self._flush_lock:
+            if not self._pending:
+                return
+            self._pending = False
+            self._wake.clear()
+            try:
+                self._write()
+                self.last_error = None
+            except Exception as e:
+                # Keep the changes pending so the next interval retries them
+                self.last_error = e
+                self.schedule()
+
+    def close(self):
+        """Stop the thread after writing any pending changes."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Coalesce the changes made during the interval into one write
+            self._stop.wait(self.interval)
+            if not self._stop.is_set():
+                self.flush()
+
+
+class ProgressStore(ABC):
+    """Interface implemented by the progress storage backends."""
+
+    @abstractmethod
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, Any]:
+        """
+        Load a user's progress.
+
+        Args:
+            user_id: Learner identity
+
+        Returns:
+            Progress document (empty if the user has none)
+        """
+
+    @abstractmethod
+    def save_section(self, user_id: str, section_type: str, section_id: str,
+                     complete: bool, timestamp: str):
+        """
+        Store one section's completion state.
+
+        Args:
+            user_id: Learner identity
+            section_type: Type of section ('study_guide' or 'labs')
+            section_id: ID of the section
+            complete: Whether the section is complete
+            timestamp: ISO timestamp of the change
+        """
+
+    @abstractmethod
+    def reset(self, user_id: str = DEFAULT_USER):
+        """
+        Delete all of a user's progress.
+
+        Args:
+            user_id: Learner identity
+        """
+
+
+class JsonProgressStore(ProgressStore):
+    """
+    Progress kept in a single JSON document on disk.
+
+    The default user's progress is the top level of the document, so files
+    written before learner identities existed keep working; other users'
+    documents are kept under "users".
+
+    With a flush interval, changes update the document in memory and return
+    at once; a background flusher rewrites the file at most once per interval
+    and on shutdown. Without one, every change rewrites the file before
+    returning. The file is always replaced atomically.
+    """
+
+    def __init__(self, path: str = PROGRESS_PATH, flush_interval: float = PROGRESS_FLUSH_INTERVAL):
+        """
+        Initialize the store.
+
+        Args:
+            path: Progress file path
+            flush_interval: Seconds between background writes (0 writes synchronously)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._document = None
+        self._flusher = DebouncedFlusher(self._write, flush_interval) if flush_interval > 0 else None
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, Any]:
+        """Load a user's progress document."""
+        with self._lock:
+            if user_id == DEFAULT_USER:
+                document = {key: value for key, value in self._load().items() if key != "users"}
+            else:
+                document = self._load().get("users", {}).get(user_id) or empty_progress()
+            return copy.deepcopy(document)
+
+    def save_section(self, user_id: str, section_type: str, section_id: str,
+                     complete: bool, timestamp: str):
+        """Update one section and write the file (now or in the background)."""
+        with self._lock:
+            document = self._user_document(user_id)
+            document.setdefault(section_type, {})[section_id] = {
+                "complete": complete,
+                "timestamp": timestamp
+            }
+            document["last_updated"] = timestamp
+        self._changed()
+
+    def reset(self, user_id: str = DEFAULT_USER):
+        """Replace a user's document with an empty one."""
+        with self._lock:
+            document = self._load()
+            if user_id == DEFAULT_USER:
+                users = document.get("users")
+                document.clear()
+                document.update(empty_progress())
+                if users:
+                    document["users"] = users
+            else:
+                document.get("users", {}).pop(user_id, None)
+        self._changed()
+
+    def flush(self):
+        """Write any changes still waiting for the background flusher."""
+        if self._flusher is not None:
+            self._flusher.flush()
+
+    def _changed(self):
+        """Persist a change according to the flush mode."""
+        if self._flusher is not None:
+            self._flusher.schedule()
+        else:
+            self._write()
+
+    def _load(self) -> Dict[str, Any]:
+        """Read the file once; later calls use the document kept in memory."""
+        if self._document is None:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self._document = json.load(f)
+            else:
+                self._document = empty_progress()
+        return self._document
+
+    def _user_document(self, user_id: str) -> Dict[str, Any]:
+        """Get a user's part of the document for changing, creating it if needed."""
+        document = self._load()
+        if user_id == DEFAULT_USER:
+            return document
+        return document.setdefault("users", {}).setdefault(user_id, empty_progress())
+
+    def _write(self):
+        """Atomically replace the file with the current document."""
+        with self._lock:
+            document = copy.deepcopy(self._load())
+        write_json_atomic(self.path, document, indent=2)
+
+
+class ShardedJsonProgressStore(ProgressStore):
+    """
+    Progress kept as one JSON file per user.
+
+    Files live under a two-level directory layout taken from a hash of the
+    user id (root/ab/cd/<hash>.json), so no directory grows too large and
+    loading or saving costs the same however many learners there are.
+    Recently used documents stay in memory; like JsonProgressStore, changes
+    are written by a background flusher unless the flush interval is 0.
+    """
+
+    def __init__(self, root: str = PROGRESS_SHARD_DIR, flush_interval: float = PROGRESS_FLUSH_INTERVAL,
+                 max_cached_users: int = 1024):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the per-user files
+            flush_interval: Seconds between background writes (0 writes synchronously)
+            max_cached_users: Number of unchanged user documents kept in memory
+        """
+        self.root = root
+        self.max_cached_users = max_cached_users
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._flusher = DebouncedFlusher(self._write_dirty, flush_interval) if flush_interval > 0 else None
+
+    def path_for(self, user_id: str) -> str:
+        """
+        Get the file holding a user's progress.
+
+        Args:
+            user_id: Learner identity
+
+        Returns:
+            File path under the store root
+        """
+        digest = hashlib.sha256(user_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.json")
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, Any]:
+        """Load a user's progress document."""
+        with self._lock:
+            return copy.deepcopy(self._load(user_id))
+
+    def save_section(self, user_id: str, section_type: str, section_id: str,
+                     complete: bool, timestamp: str):
+        """Update one section in a user's document and write it (now or in the background)."""
+        with self._lock:
+            document = self._load(user_id)
+            document.setdefault(section_type, {})[section_id] = {
+                "complete": complete,
+                "timestamp": timestamp
+            }
+            document["last_updated"] = timestamp
+            self._dirty.add(user_id)
+        self._changed(user_id)
+
+    def reset(self, user_id: str = DEFAULT_USER):
+        """Replace a user's document with an empty one."""
+        with self._lock:
+            self._documents[user_id] = empty_progress()
+            self._documents.move_to_end(user_id)
+            self._dirty.add(user_id)
+        self._changed(user_id)
+
+    def flush(self):
+        """Write any changes still waiting for the background flusher."""
+        if self._flusher is not None:
+            self._flusher.flush()
+
+    def _changed(self, user_id: str):
+        """Persist a change according to the flush mode."""
+        if self._flusher is not None:
+            self._flusher.schedule()
+        else:
+            self._write_dirty()
+
+    def _load(self, user_id: str) -> Dict[str, Any]:
+        """Get a user's document from memory, reading its file on a miss."""
+        document = self._documents.get(user_id)
+        if document is None:
+            path = self.path_for(user_id)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    document = json.load(f)
+            else:
+                document = empty_progress()
+            self._documents[user_id] = document
+            self._evict()
+        self._documents.move_to_end(user_id)
+        return document
+
+    def _evict(self):
+        """Drop the least recently used documents that have no unwritten changes."""
+        excess = len(self._documents) - self.max_cached_users
+        for user_id in list(self._documents):
+            if excess <= 0:
+                break
+            if user_id not in self._dirty:
+                del self._documents[user_id]
+                excess -= 1
+
+    def _write_dirty(self):
+        """Atomically write the file of every user with unwritten changes."""
+        with self._lock:
+            pending = {user_id: copy.deepcopy(self._documents[user_id]) for user_id in self._dirty}
+            self._dirty.clear()
+        try:
+            for user_id, document in list(pending.items()):
+                path = self.path_for(user_id)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_json_atomic(path, document)
+                del pending[user_id]
+        finally:
+            if pending:
+                # Keep what was not written for the next attempt
+                with self._lock:
+                    self._dirty.update(pending)
+
+
+class SQLiteProgressStore(ProgressStore):
+    """Progress kept as one row per user and section in SQLite."""
+
+    def __init__(self, path: str = PROGRESS_DB_PATH):
+        """
+        Open (and create if needed) the progress database.
+
+        Args:
+            path: Database file path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets sessions in other worker processes read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS progress ("
+                "user_id TEXT NOT NULL, section_type TEXT NOT NULL, section_id TEXT NOT NULL, "
+                "complete INTEGER NOT NULL, timestamp TEXT NOT NULL, "
+                "PRIMARY KEY (user_id, section_type, section_id)) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS progress_users ("
+                "user_id TEXT PRIMARY KEY, last_updated TEXT NOT NULL) WITHOUT ROWID"
+            )
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, Any]:
+        """Load a user's rows into a progress document."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT section_type, section_id, complete, timestamp FROM progress WHERE user_id = ?",
+                (user_id,)
+            ).fetchall()
+            user = self._conn.execute(
+                "SELECT last_updated FROM progress_users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+
+        document = empty_progress()
+        for section_type, section_id, complete, timestamp in rows:
+            document.setdefault(section_type, {})[section_id] = {
+                "complete": bool(complete),
+                "timestamp": timestamp
+            }
+        if user:
+            document["last_updated"] = user[0]
+        return document
+
+    def save_section(self, user_id: str, section_type: str, section_id: str,
+                     complete: bool, timestamp: str):
+        """Upsert one section row."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO progress (user_id, section_type, section_id, complete, timestamp) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, section_type, section_id) "
+                "DO UPDATE SET complete = excluded.complete, timestamp = excluded.timestamp",
+                (user_id, section_type, section_id, int(complete), timestamp)
+            )
+            self._conn.execute(
+                "INSERT INTO progress_users (user_id, last_updated) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET last_updated = excluded.last_updated",
+                (user_id, timestamp)
+            )
+
+    def reset(self, user_id: str = DEFAULT_USER):
+        """Delete a user's rows."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM progress WHERE user_id = ?", (user_id,))
+            self._conn.execute("DELETE FROM progress_users WHERE user_id = ?", (user_id,))
+
+
+class JournalProgressStore(ProgressStore):
+    """
+    Progress kept as an append-only log of change events.
+
+    Each change appends one JSON line to the journal and fsyncs it, so a write
+    costs the same however much progress is stored, and a crash can at worst
+    lose the line being written. On startup the snapshot is loaded and the
+    journal replayed on top of it. Every `compact_events` events a background
+    thread folds the journal into a new snapshot, which replaces the old one
+    atomically. The compacted events are appended to a history file, keeping
+    the full completion history for analytics.
+    """
+
+    def __init__(self, path: str = PROGRESS_JOURNAL_PATH, compact_events: int = PROGRESS_COMPACT_EVENTS):
+        """
+        Open the journal, replaying it into memory.
+
+        Args:
+            path: Journal file path; the snapshot and history are stored next to it
+            compact_events: Number of journal events that triggers a compaction (0 disables it)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot.json"
+        self.history_path = f"{path}.history"
+        self.compacting_path = f"{path}.compacting"
+        self.compact_events = compact_events
+
+        self._lock = threading.Lock()
+        self._compaction = None
+        self._users: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                self._users = json.load(f).get("users", {})
+        # A segment left by an interrupted compaction comes before the live journal.
+        # Events set absolute state, so replaying ones already in the snapshot is harmless.
+        interrupted = os.path.exists(self.compacting_path)
+        self._replay(self.compacting_path)
+        self._events = self._replay(self.path)
+        if interrupted:
+            self._finish_compaction(self._users)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file.tell() and not self._ends_with_newline():
+            # Keep a torn final line from swallowing the next event
+            self._file.write("\n")
+
+    def load(self, user_id: str = DEFAULT_USER) -> Dict[str, Any]:
+        """Return a copy of a user's replayed progress."""
+        with self._lock:
+            document = self._users.get(user_id)
+            return copy.deepcopy(document) if document else empty_progress()
+
+    def save_section(self, user_id: str, section_type: str, section_id: str,
+                     complete: bool, timestamp: str):
+        """Append a section change event."""
+        self._record({"user": user_id, "type": section_type, "id": section_id,
+                      "complete": complete, "ts": timestamp})
+
+    def reset(self, user_id: str = DEFAULT_USER):
+        """Append a reset event."""
+        self._record({"user": user_id, "event": "reset", "ts": datetime.now().isoformat()})
+
+    def compact(self):
+        """Fold the journal into a new snapshot and move its events to the history file."""
+        with self._lock:
+            if self._events == 0 or os.path.exists(self.compacting_path):
+                return
+            # Start a new journal segment; writers only wait for the rename
+            self._file.close()
+            os.replace(self.path, self.compacting_path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            users = copy.deepcopy(self._users)
+            self._events = 0
+
+        self._finish_compaction(users)
+
+    def _finish_compaction(self, users: Dict[str, Dict[str, Any]]):
+        """Write the snapshot, then move the compacted segment to the history file."""
+        write_json_atomic(self.snapshot_path, {"users": users})
+
+        with open(self.compacting_path, 'r', encoding='utf-8') as segment, \
+                open(self.history_path, 'a', encoding='utf-8') as history:
+            for line in segment:
+                history.write(line)
+            history.flush()
+            os.fsync(history.fileno())
+        os.remove(self.compacting_path)
+
+    def _record(self, event: Dict[str, Any]):
+        """Apply an event in memory and append it durably to the journal."""
+        line = json.dumps(event, separators=(',', ':')) + "\n"
+        with self._lock:
+            self._apply(event)
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._events += 1
+            if self.compact_events and self._events >= self.compact_events and not self._compacting():
+                self._compaction = threading.Thread(target=self.compact, daemon=True)
+                self._compaction.start()
+
+    def _compacting(self) -> bool:
+        """Check whether a background compaction is running."""
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _apply(self, event: Dict[str, Any]):
+        """Apply one event to the in-memory progress documents."""
+        if event.get("event") == "reset":
+            self._users[event["user"]] = empty_progress()
+            self._users[event["user"]]["last_updated"] = event["ts"]
+            return
+        document = self._users.setdefault(event["user"], empty_progress())
+        document.setdefault(event["type"], {})[event["id"]] = {
+            "complete": event["complete"],
+            "timestamp": event["ts"]
+        }
+        document["last_updated"] = event["ts"]
+
+    def _ends_with_newline(self) -> bool:
+        """Check whether the journal's last line is complete."""
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _replay(self, path: str) -> int:
+        """Apply the events in a journal file, returning how many were applied."""
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-append
+                    continue
+                self._apply(event)
+                count += 1
+        return count
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    """
+    Get the process-wide progress store selected by PROGRESS_STORE.
+
+    Returns:
+        ProgressStore instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if PROGRESS_STORE == "sqlite":
+                    _store = SQLiteProgressStore()
+                elif PROGRESS_STORE == "sharded":
+                    _store = ShardedJsonProgressStore()
+                elif PROGRESS_STORE == "journal":
+                    _store = JournalProgressStore()
+                elif PROGRESS_STORE == "json":
+                    _store = JsonProgressStore()
+                else:
+                    raise ValueError(f"Unknown progress store: {PROGRESS_STORE}")
+    return _store
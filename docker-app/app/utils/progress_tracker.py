@@ -1,44 +1,52 @@
 """
 Utility for tracking user progress through the course.
+
+ProgressTracker is the Streamlit-facing adapter over the progress repository:
+it identifies the session's learner and reports storage errors in the page.
+Agent tools use the repository directly.
 """
 
-import json
-import os
 import streamlit as st
-from datetime import datetime
+from app.utils.progress_repository import (
+    ProgressRepository, get_file_progress_repository, get_progress_repository
+)
+from app.utils.user_identity import get_user_id
 
 class ProgressTracker:
     """
     Tracks user progress through the course content.
     """
     
-    def __init__(self, save_to_file=True, file_path="progress.json"):
+    def __init__(self, save_to_file=True, file_path=None, store=None, user_id=None):
         """
         Initialize the progress tracker.
         
         Args:
-            save_to_file (bool): Whether to save progress to a file
-            file_path (str): Path to save the progress file
+            save_to_file (bool): Whether to persist progress
+            file_path (str, optional): JSON file to use instead of the configured store
+            store (ProgressStore, optional): Storage backend (defaults to PROGRESS_STORE)
+            user_id (str, optional): Learner whose progress is tracked
+                                     (defaults to the session's identity)
         """
         self.save_to_file = save_to_file
-        self.file_path = file_path
+        self.user_id = user_id or get_user_id()
+        if not save_to_file:
+            # Unsaved progress lasts for the browser session, across reruns
+            if "progress_repository" not in st.session_state:
+                st.session_state.progress_repository = ProgressRepository(store=None)
+            self.repository = st.session_state.progress_repository
+        elif store is not None:
+            self.repository = ProgressRepository(store)
+        elif file_path:
+            self.repository = get_file_progress_repository(file_path)
+        else:
+            self.repository = get_progress_repository()
         
-        # Initialize progress in session state if not already present
-        if "progress" not in st.session_state:
-            st.session_state.progress = {
-                "study_guide": {},
-                "labs": {},
-                "last_updated": datetime.now().isoformat()
-            }
-            
-            # Load progress from file if it exists
-            if save_to_file and os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r') as f:
-                        saved_progress = json.load(f)
-                        st.session_state.progress = saved_progress
-                except Exception as e:
-                    st.error(f"Error loading progress: {e}")
+        try:
+            self.progress = self.repository.get(self.user_id)
+        except Exception as e:
+            st.error(f"Error loading progress: {e}")
+            self.progress = ProgressRepository(store=None).get(self.user_id)
     
     def mark_complete(self, section_type, section_id, status=True):
         """
@@ -49,20 +57,20 @@ class ProgressTracker:
             section_id (str): ID of the section
             status (bool): Whether the section is complete
         """
-        if section_type not in st.session_state.progress:
-            st.session_state.progress[section_type] = {}
-            
-        st.session_state.progress[section_type][section_id] = {
-            "complete": status,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Update last updated timestamp
-        st.session_state.progress["last_updated"] = datetime.now().isoformat()
+        try:
+            self.repository.mark_complete(self.user_id, section_type, section_id, status)
+        except Exception as e:
+            st.error(f"Error saving progress: {e}")
+    
+    def mark_incomplete(self, section_type, section_id):
+        """
+        Mark a section as incomplete.
         
-        # Save to file if enabled
-        if self.save_to_file:
-            self._save_progress()
+        Args:
+            section_type (str): Type of section ('study_guide' or 'labs')
+            section_id (str): ID of the section
+        """
+        self.mark_complete(section_type, section_id, False)
     
     def is_complete(self, section_type, section_id):
         """
@@ -71,17 +79,23 @@ class ProgressTracker:
         Args:
             section_type (str): Type of section ('study_guide' or 'labs')
             section_id (str): ID of the section
-            
+        
         Returns:
             bool: True if the section is complete, False otherwise
         """
-        if section_type not in st.session_state.progress:
-            return False
-            
-        if section_id not in st.session_state.progress[section_type]:
-            return False
-            
-        return st.session_state.progress[section_type][section_id].get("complete", False)
+        return self.progress.is_complete(section_type, section_id)
+    
+    def get_completed_sections(self, section_type):
+        """
+        Get the sections of a type that are marked as complete.
+        
+        Args:
+            section_type (str): Type of section ('study_guide' or 'labs')
+        
+        Returns:
+            list: IDs of the completed sections
+        """
+        return self.progress.completed_sections(section_type)
     
     def get_completion_percentage(self, section_type=None):
         """
@@ -90,32 +104,11 @@ class ProgressTracker:
         Args:
             section_type (str, optional): Type of section to calculate percentage for.
                                          If None, calculates for all sections.
-                                         
+        
         Returns:
             float: Percentage of sections that are complete (0-100)
         """
-        if section_type:
-            if section_type not in st.session_state.progress:
-                return 0
-                
-            sections = st.session_state.progress[section_type]
-            if not sections:
-                return 0
-                
-            complete = sum(1 for s in sections.values() if s.get("complete", False))
-            return (complete / len(sections)) * 100
-        else:
-            # Calculate for all sections
-            all_sections = []
-            for s_type in ["study_guide", "labs"]:
-                if s_type in st.session_state.progress:
-                    all_sections.extend(st.session_state.progress[s_type].values())
-            
-            if not all_sections:
-                return 0
-                
-            complete = sum(1 for s in all_sections if s.get("complete", False))
-            return (complete / len(all_sections)) * 100
+        return self.progress.completion_percentage(section_type)
     
     def get_last_visited(self):
         """
@@ -125,42 +118,22 @@ class ProgressTracker:
             tuple: (section_type, section_id) of the last visited section,
                   or (None, None) if no sections have been visited
         """
-        last_timestamp = None
-        last_section = (None, None)
-        
-        for section_type in ["study_guide", "labs"]:
-            if section_type not in st.session_state.progress:
-                continue
-                
-            for section_id, data in st.session_state.progress[section_type].items():
-                if "timestamp" in data:
-                    timestamp = datetime.fromisoformat(data["timestamp"])
-                    if last_timestamp is None or timestamp > last_timestamp:
-                        last_timestamp = timestamp
-                        last_section = (section_type, section_id)
-        
-        return last_section
+        return self.progress.last_visited()
     
-    def reset_progress(self):
-        """
-        Reset all progress.
+    def get_last_updated(self):
         """
-        st.session_state.progress = {
-            "study_guide": {},
-            "labs": {},
-            "last_updated": datetime.now().isoformat()
-        }
+        Get when progress last changed.
         
-        # Save to file if enabled
-        if self.save_to_file:
-            self._save_progress()
+        Returns:
+            str: ISO timestamp, or None if progress has never been saved
+        """
+        return self.progress.last_updated()
     
-    def _save_progress(self):
+    def reset_progress(self):
         """
-        Save progress to file.
+        Reset all progress.
         """
         try:
-            with open(self.file_path, 'w') as f:
-                json.dump(st.session_state.progress, f, indent=2)
+            self.repository.reset(self.user_id)
         except Exception as e:
             st.error(f"Error saving progress: {e}")
@@ -0,0 +1,283 @@
+"""
+Client-side rate limiting and request coalescing for Bedrock.
+
+Bedrock enforces per-model quotas on requests per minute (RPM) and tokens per
+minute (TPM). When many learners ask at once, going over the quota returns
+ThrottlingException, and the retries that follow make the overload worse.
+Each model gets a pair of token buckets sized from BEDROCK_RPM and
+BEDROCK_TPM. Callers wait for capacity before sending, so throughput stays at
+the quota instead of collapsing into retries.
+
+The token cost of a request is not known until it finishes. A request
+reserves an estimate (prompt length / 4 plus the output limit) and settles
+the difference once the real usage is reported.
+
+SingleFlight lets identical in-flight requests share one upstream call.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from app.config import BEDROCK_RPM, BEDROCK_TPM, BEDROCK_RATE_LIMIT_WAIT
+
+# Output tokens assumed when a request sets no limit
+DEFAULT_OUTPUT_TOKENS = 1000
+
+
+class BedrockThrottlingError(Exception):
+    """Raised when Bedrock throttles a request or the local rate limit cannot be met in time."""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of tokens in a text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count (about four characters per token)
+    """
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Tokens added per minute, which is also the bucket capacity
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def acquire(self, amount: float, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the bucket holds `amount` tokens and take them.
+
+        Args:
+            amount: Tokens to take; amounts above the capacity take a full bucket
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        amount = min(amount, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return True
+
+                wait = (amount - self.tokens) / self.rate
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._condition.wait(wait)
+
+    def adjust(self, amount: float):
+        """
+        Return tokens to the bucket (positive) or charge extra ones (negative).
+
+        The balance may go below zero, in which case later callers wait longer.
+
+        Args:
+            amount: Tokens to add or remove
+        """
+        with self._condition:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self._condition.notify_all()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class ModelRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one model."""
+
+    def __init__(self, rpm: int = BEDROCK_RPM, tpm: int = BEDROCK_TPM,
+                 max_wait: float = BEDROCK_RATE_LIMIT_WAIT):
+        """
+        Initialize the limiter.
+
+        Args:
+            rpm: Requests per minute quota; 0 disables the request limit
+            tpm: Tokens per minute quota; 0 disables the token limit
+            max_wait: Maximum seconds a request waits for capacity
+        """
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_wait = max_wait
+
+    def acquire(self, estimated_tokens: int) -> int:
+        """
+        Wait for capacity to send one request.
+
+        Args:
+            estimated_tokens: Expected input plus output tokens
+
+        Returns:
+            The number of tokens reserved, to pass to settle()
+
+        Raises:
+            BedrockThrottlingError: If capacity does not free up within max_wait
+        """
+        deadline = time.monotonic() + self.max_wait
+
+        if self.requests is not None and not self.requests.acquire(1, self.max_wait):
+            raise BedrockThrottlingError("Bedrock request rate limit reached. Please try again shortly.")
+
+        if self.tokens is None:
+            return 0
+        reserved = int(min(estimated_tokens, self.tokens.capacity))
+        if not self.tokens.acquire(reserved, max(0.0, deadline - time.monotonic())):
+            raise BedrockThrottlingError("Bedrock token rate limit reached. Please try again shortly.")
+        return reserved
+
+    def settle(self, reserved: int, actual_tokens: Optional[int]):
+        """
+        Correct a reservation once the real token usage is known.
+
+        Args:
+            reserved: Tokens returned by acquire()
+            actual_tokens: Tokens the request used, or None if unknown
+        """
+        if self.tokens is not None and actual_tokens is not None:
+            self.tokens.adjust(reserved - actual_tokens)
+
+
+class SingleFlight:
+    """Shares one call between concurrent callers using the same key."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn: Function performing the call
+
+        Returns:
+            The result of fn (shared by every caller that joined the call)
+        """
+        call, leader = self._join(key)
+        if not leader:
+            return self._wait(call)
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+        finally:
+            self._finish(key, call)
+        return self._wait(call)
+
+    def do_stream(self, key: str, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Stream fn's chunks, or wait for the identical call already in flight.
+
+        The caller that starts the call streams it as it is generated. Callers
+        that join it get the whole text in one chunk when it finishes, and
+        so do callers of do() with the same key.
+
+        Args:
+            key: Identifies identical calls
+            fn: Function returning an iterator of text chunks
+
+        Yields:
+            Text chunks
+        """
+        call, leader = self._join(key)
+        if not leader:
+            yield self._wait(call)
+            return
+
+        chunks = []
+        try:
+            for chunk in fn():
+                chunks.append(chunk)
+                yield chunk
+            call.result = "".join(chunks)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            if call.result is None and call.error is None:
+                # The caller stopped reading before the answer was complete
+                call.error = RuntimeError("The identical request in flight was cancelled")
+            self._finish(key, call)
+
+    def _join(self, key: str) -> Tuple["SingleFlight._Call", bool]:
+        """Join the call in flight for key, or register a new one; returns (call, is_leader)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = SingleFlight._Call()
+            return call, True
+
+    def _finish(self, key: str, call: "SingleFlight._Call"):
+        """Publish a finished call to the callers waiting on it."""
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+    @staticmethod
+    def _wait(call: "SingleFlight._Call") -> Any:
+        """Wait for a call to finish and return its result or raise its error."""
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+def request_key(*parts: Any) -> str:
+    """Hash request parameters into a single-flight key."""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+_limiters: Dict[str, ModelRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_id: str) -> ModelRateLimiter:
+    """
+    Get the process-wide rate limiter for a model.
+
+    Args:
+        model_id: Bedrock model ID
+
+    Returns:
+        ModelRateLimiter instance
+    """
+    with _limiters_lock:
+        if model_id not in _limiters:
+            _limiters[model_id] = ModelRateLimiter()
+        return _limiters[model_id]
@@ -0,0 +1,355 @@
+"""
+Answer cache for the coordinator.
+
+Cohorts ask the same questions over and over, and each routed question costs
+up to five Bedrock calls. Answers are cached under the normalized question,
+the domains it was routed to, the model id and the conversation context, with a time-to-live and
+least-recently-used eviction.
+
+Lookups match the normalized question exactly, so "Explain AWS Glue" and
+"explain aws glue?" share an answer. Setting RESPONSE_CACHE_SIMILARITY above
+zero adds a near-duplicate tier: an entry for the same domains and model also
+matches when its content-word set is similar enough (Jaccard similarity) and
+every word the two questions do not share is a filler word such as "please"
+or "tell me about". A different service name, "not" or "without" never
+matches, however similar the rest of the question is.
+
+Two backends are available through RESPONSE_CACHE:
+"memory" keeps entries in this process, "sqlite" stores them in a file at
+RESPONSE_CACHE_PATH that is shared by every Streamlit worker process on the
+host. "off" disables caching.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional
+
+from app.config import (
+    RESPONSE_CACHE, RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_SIMILARITY
+)
+from app.utils.content_index import tokenize
+from app.utils.section_ranker import STOPWORDS
+
+
+@dataclass
+class CacheEntry:
+    """A cached answer."""
+    key: str
+    scope: str
+    terms: FrozenSet[str]
+    answer: str
+    created: float
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question for exact matching.
+
+    Args:
+        question: Question text
+
+    Returns:
+        Lowercased question with punctuation and extra whitespace removed
+    """
+    return ' '.join(tokenize(question))
+
+
+# Words whose presence does not change what is being asked. Negations and
+# qualifiers ("not", "without", "except") must never be listed here.
+FILLER_TERMS = frozenset("""
+    about briefly describe explain give me please quick quickly tell overview
+""".split())
+
+
+def question_terms(question: str) -> FrozenSet[str]:
+    """
+    Get the content words of a question for near-duplicate matching.
+
+    Args:
+        question: Question text
+
+    Returns:
+        Set of lowercased terms without stopwords
+    """
+    return frozenset(term for term in tokenize(question) if term not in STOPWORDS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two term sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def near_duplicate_score(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    Score how closely two questions' term sets ask the same thing.
+
+    Args:
+        a: Terms of one question
+        b: Terms of the other question
+
+    Returns:
+        Jaccard similarity, or 0 if the sets differ in anything but filler words
+    """
+    if (a ^ b) - FILLER_TERMS:
+        return 0.0
+    return jaccard(a, b)
+
+
+class MemoryCacheBackend:
+    """In-process LRU store of cache entries."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Initialize the backend.
+
+        Args:
+            max_entries: Number of entries kept before the least recently used are evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, oldest: float) -> Optional[CacheEntry]:
+        """Return the entry for a key if it was created at or after `oldest`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.created < oldest:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def candidates(self, scope: str, oldest: float) -> List[CacheEntry]:
+        """Return the unexpired entries in a scope."""
+        with self._lock:
+            return [entry for entry in self._entries.values()
+                    if entry.scope == scope and entry.created >= oldest]
+
+    def touch(self, key: str):
+        """Mark an entry as recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def put(self, entry: CacheEntry):
+        """Store an entry, evicting the least recently used beyond the size limit."""
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """SQLite store of cache entries shared between processes."""
+
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Database file path
+            max_entries: Number of entries kept before the least recently used are evicted
+        """
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets readers in other worker processes proceed while one process writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, scope TEXT NOT NULL, terms TEXT NOT NULL, "
+                "answer TEXT NOT NULL, created REAL NOT NULL, used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+
+    def get(self, key: str, oldest: float) -> Optional[CacheEntry]:
+        """Return the entry for a key if it was created at or after `oldest`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, scope, terms, answer, created FROM responses WHERE key = ? AND created >= ?",
+                (key, oldest)
+            ).fetchone()
+        if row is None:
+            return None
+        self.touch(key)
+        return self._entry(row)
+
+    def candidates(self, scope: str, oldest: float) -> List[CacheEntry]:
+        """Return the unexpired entries in a scope."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, scope, terms, answer, created FROM responses WHERE scope = ? AND created >= ?",
+                (scope, oldest)
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def touch(self, key: str):
+        """Mark an entry as recently used."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET used = ? WHERE key = ?", (time.time(), key))
+
+    def put(self, entry: CacheEntry):
+        """Store an entry, evicting the least recently used beyond the size limit."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, scope, terms, answer, created, used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entry.key, entry.scope, ' '.join(sorted(entry.terms)), entry.answer,
+                 entry.created, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    @staticmethod
+    def _entry(row) -> CacheEntry:
+        """Build a CacheEntry from a database row."""
+        key, scope, terms, answer, created = row
+        return CacheEntry(key, scope, frozenset(terms.split()), answer, created)
+
+
+class ResponseCache:
+    """Caches answers by normalized question, routed domains and model id."""
+
+    def __init__(self, backend, ttl: float = RESPONSE_CACHE_TTL,
+                 similarity: float = RESPONSE_CACHE_SIMILARITY):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: MemoryCacheBackend or SQLiteCacheBackend
+            ttl: Seconds an answer stays valid
+            similarity: Minimum Jaccard similarity for a near-duplicate hit
+                        (see near_duplicate_score); 0 disables the tier
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.similarity = similarity
+
+    def get(self, question: str, domains: List[str], model_id: str, context: str = "") -> Optional[str]:
+        """
+        Look up a cached answer.
+
+        Args:
+            question: The user's question
+            domains: Domains the question was routed to
+            model_id: Model that produced the answer
+            context: Conversation context the question was asked with
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        scope = self._scope(domains, model_id, context)
+        oldest = time.time() - self.ttl
+
+        entry = self.backend.get(self._key(scope, question), oldest)
+        if entry is not None:
+            return entry.answer
+
+        if self.similarity <= 0:
+            return None
+
+        terms = question_terms(question)
+        best, best_score = None, self.similarity
+        for candidate in self.backend.candidates(scope, oldest):
+            score = near_duplicate_score(terms, candidate.terms)
+            if score >= best_score:
+                best, best_score = candidate, score
+        if best is None:
+            return None
+
+        self.backend.touch(best.key)
+        return best.answer
+
+    def put(self, question: str, domains: List[str], model_id: str, answer: str, context: str = ""):
+        """
+        Cache an answer.
+
+        Args:
+            question: The user's question
+            domains: Domains the question was routed to
+            model_id: Model that produced the answer
+            answer: The answer to cache
+            context: Conversation context the question was asked with
+        """
+        # Questions without content words ("tell me more") depend on the conversation
+        terms = question_terms(question)
+        if not terms:
+            return
+
+        scope = self._scope(domains, model_id, context)
+        self.backend.put(CacheEntry(self._key(scope, question), scope, terms, answer, time.time()))
+
+    def clear(self):
+        """Remove all cached answers."""
+        self.backend.clear()
+
+    @staticmethod
+    def _scope(domains: List[str], model_id: str, context: str = "") -> str:
+        """Entries only match questions routed to the same domains and model, with the same context."""
+        scope = f"{model_id}|{','.join(sorted(domains))}"
+        if context:
+            # The specialists see the context, so it shapes the answer
+            scope += f"|{hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]}"
+        return scope
+
+    @staticmethod
+    def _key(scope: str, question: str) -> str:
+        """Hash the scope and normalized question into a cache key."""
+        return hashlib.sha256(f"{scope}|{normalize_question(question)}".encode('utf-8')).hexdigest()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        ResponseCache instance, or None when RESPONSE_CACHE is "off"
+    """
+    global _cache
+    if RESPONSE_CACHE == "off":
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if RESPONSE_CACHE == "sqlite":
+                    backend = SQLiteCacheBackend()
+                elif RESPONSE_CACHE == "memory":
+                    backend = MemoryCacheBackend()
+                else:
+                    raise ValueError(f"Unknown response cache backend: {RESPONSE_CACHE}")
+                _cache = ResponseCache(backend)
+    return _cache
@@ -0,0 +1,280 @@
+"""
+BM25 ranking over heading-delimited sections of the course content.
+
+The study guide and labs are split into sections at every markdown heading
+(using the shared document store) and a term-frequency table is precomputed
+once per process, so a query is scored against every section without touching
+the disk and only the best sections are returned.
+"""
+
+import math
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from app.config import STUDY_GUIDE_PATH, LABS_PATH
+from app.catalog import get_catalog
+from app.utils.content_index import tokenize
+from app.utils.document_store import get_document_store
+
+# Function words that carry no topical signal in questions
+STOPWORDS = frozenset("""
+    a an and are as at be by can do does for from how i in is it my of on or
+    should the to use what when which why with you your
+""".split())
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+@dataclass
+class RankedSection:
+    """A heading-delimited section of a content file, as scored by the ranker."""
+    source: str
+    title: str
+    level: int
+    text: str
+    domain: str = ""
+
+
+class SectionRanker:
+    """BM25 ranker over sections of the study guide and labs."""
+
+    def __init__(self, study_guide_path: str = STUDY_GUIDE_PATH, labs_path: str = LABS_PATH):
+        """
+        Initialize an empty ranker.
+
+        Args:
+            study_guide_path: Directory containing the study guide markdown files
+            labs_path: Directory containing the lab markdown files
+        """
+        self.study_guide_path = study_guide_path
+        self.labs_path = labs_path
+        self.sections: List[RankedSection] = []
+        self.term_frequencies: List[Counter] = []
+        self.lengths: List[int] = []
+        self.document_frequencies: Counter = Counter()
+        self.average_length = 0.0
+        self._lock = threading.Lock()
+
+    def build(self) -> "SectionRanker":
+        """Split all content files into sections and precompute the term-frequency table."""
+        sections = []
+        for file_path in self.content_files():
+            sections.extend(self.read_sections(file_path))
+
+        term_frequencies = [self._term_frequencies(section) for section in sections]
+        document_frequencies = Counter()
+        for tf in term_frequencies:
+            document_frequencies.update(tf.keys())
+
+        self._replace(sections, term_frequencies, document_frequencies)
+        return self
+
+    def update_file(self, file_path: str):
+        """
+        Re-index the sections of a single changed, created or deleted file.
+
+        Sections of other files keep their precomputed term frequencies; only the
+        document frequencies of the removed and added sections are adjusted.
+
+        Args:
+            file_path: Path of the content file that changed
+        """
+        if not file_path.endswith('.md') or not self.is_content_file(file_path):
+            return
+
+        source = self.source_for(file_path)
+        added = self.read_sections(file_path)
+        added_frequencies = [self._term_frequencies(section) for section in added]
+
+        with self._lock:
+            sections, term_frequencies = [], []
+            document_frequencies = Counter(self.document_frequencies)
+            for section, tf in zip(self.sections, self.term_frequencies):
+                if section.source == source:
+                    document_frequencies.subtract(tf.keys())
+                else:
+                    sections.append(section)
+                    term_frequencies.append(tf)
+
+            for tf in added_frequencies:
+                document_frequencies.update(tf.keys())
+
+            self._replace(sections + added, term_frequencies + added_frequencies,
+                          +document_frequencies, locked=True)
+
+    def read_sections(self, file_path: str) -> List[RankedSection]:
+        """
+        Get the ranked sections of one content file from the document store.
+
+        Args:
+            file_path: Path of a study guide or lab markdown file
+
+        Returns:
+            Sections in document order, or an empty list if the file no longer exists
+        """
+        try:
+            document = get_document_store().get(file_path)
+        except FileNotFoundError:
+            return []
+
+        source = self.source_for(file_path)
+        domain = self._file_domains().get(os.path.normpath(file_path), "")
+        return [
+            RankedSection(source, section.path, section.level, section.text, domain)
+            for section in document.walk()
+        ]
+
+    def score(self, query: str, domain: str = "") -> List[Tuple[float, RankedSection]]:
+        """
+        Score every section against a query with BM25.
+
+        Args:
+            query: Free-text query
+            domain: Optional domain filter (domain1, domain2, domain3, domain4);
+                    an unknown domain searches every section
+
+        Returns:
+            List of (score, section) pairs with a positive score, best first
+        """
+        if domain and domain not in {section.id for section in get_catalog().domains}:
+            domain = ""
+
+        with self._lock:
+            sections, term_frequencies, lengths = self.sections, self.term_frequencies, self.lengths
+            document_frequencies, average_length = self.document_frequencies, self.average_length
+
+        terms = set(tokenize(query)) - STOPWORDS
+        total = len(sections)
+        idf = {
+            term: math.log(1 + (total - document_frequencies[term] + 0.5) / (document_frequencies[term] + 0.5))
+            for term in terms if document_frequencies[term]
+        }
+        if not idf:
+            return []
+
+        scores = []
+        for position, tf in enumerate(term_frequencies):
+            if domain and sections[position].domain != domain:
+                continue
+
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[position] / average_length)
+            score = 0.0
+            for term, weight in idf.items():
+                frequency = tf.get(term, 0)
+                if frequency:
+                    score += weight * frequency * (BM25_K1 + 1) / (frequency + length_norm)
+            if score > 0:
+                scores.append((score, position))
+
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        return [(score, sections[position]) for score, position in scores]
+
+    def search(self, query: str, top_k: int = 5, char_budget: int = 6000, domain: str = "") -> List[RankedSection]:
+        """
+        Return the best matching sections within a character budget.
+
+        Sections are added in rank order until the budget is spent; the section
+        that crosses the budget is truncated rather than dropped.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of sections to return
+            char_budget: Maximum total characters of section text to return
+            domain: Optional domain filter (domain1, domain2, domain3, domain4);
+                    an unknown domain searches every section
+
+        Returns:
+            List of sections, best first
+        """
+        results = []
+        remaining = char_budget
+
+        for _, section in self.score(query, domain)[:top_k]:
+            if remaining <= 0:
+                break
+            if len(section.text) > remaining:
+                section = RankedSection(section.source, section.title, section.level,
+                                        section.text[:remaining].rstrip() + "\n...", section.domain)
+            results.append(section)
+            remaining -= len(section.text)
+
+        return results
+
+    def _replace(self, sections: List[RankedSection], term_frequencies: List[Counter],
+                 document_frequencies: Counter, locked: bool = False):
+        """Swap in a new term-frequency table so concurrent queries see a consistent one."""
+        lengths = [sum(tf.values()) for tf in term_frequencies]
+        average_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+        if not locked:
+            self._lock.acquire()
+        try:
+            self.sections = sections
+            self.term_frequencies = term_frequencies
+            self.lengths = lengths
+            self.document_frequencies = document_frequencies
+            self.average_length = average_length
+        finally:
+            if not locked:
+                self._lock.release()
+
+    @staticmethod
+    def _term_frequencies(section: RankedSection) -> Counter:
+        """Count section terms; parent headings are included so sub-sections inherit their topic."""
+        return Counter(tokenize(f"{section.title}\n{section.text}"))
+
+    def source_for(self, file_path: str) -> str:
+        """Return the file path relative to the content root (e.g. "labs/README.md")."""
+        return os.path.relpath(file_path, os.path.dirname(os.path.normpath(self.study_guide_path)))
+
+    def is_content_file(self, file_path: str) -> bool:
+        """Check whether a path lies under the study guide or labs directory."""
+        file_path = os.path.abspath(file_path)
+        return any(
+            os.path.commonpath([file_path, os.path.abspath(root)]) == os.path.abspath(root)
+            for root in (self.study_guide_path, self.labs_path)
+        )
+
+    def _file_domains(self) -> Dict[str, str]:
+        """Map study guide and lab file paths to their domain."""
+        file_domains: Dict[str, str] = {}
+        for section in get_catalog().sections:
+            if section.domain:
+                root = self.study_guide_path if section.section_type == "study_guide" else self.labs_path
+                file_domains[os.path.normpath(os.path.join(root, section.file))] = section.domain
+        return file_domains
+
+    def content_files(self) -> List[str]:
+        """Return the path of every study guide and lab markdown file."""
+        files = []
+        for root_path in (self.study_guide_path, self.labs_path):
+            for root, dirs, names in os.walk(root_path):
+                for name in names:
+                    if name.endswith('.md'):
+                        files.append(os.path.join(root, name))
+        return sorted(files)
+
+
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_section_ranker() -> SectionRanker:
+    """
+    Get the process-wide section ranker, building it on first use.
+
+    Returns:
+        SectionRanker instance
+    """
+    global _ranker
+    if _ranker is None:
+        with _ranker_lock:
+            if _ranker is None:
+                _ranker = SectionRanker().build()
+                get_document_store().subscribe(_ranker.update_file)
+    return _ranker
@@ -0,0 +1,115 @@
+"""
+Learner identity for per-user progress.
+
+The identity comes from the first configured source that yields one:
+USER_ID_HOOK names a function ("package.module:function") that returns the
+user id, USER_ID_HEADER names a request header set by an authenticating
+reverse proxy (e.g. "X-Forwarded-User"), and USER_ID_QUERY_PARAM names a
+query parameter (e.g. "?user=alice"). Without any, every session uses the
+shared default user, as before.
+
+Agent tools run outside the Streamlit script, where there is no request to
+read. The chat interface runs the assistant inside `acting_as(user_id)`,
+which sets a context variable that the agent threads inherit.
+"""
+
+import contextvars
+import importlib
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from app.config import USER_ID_HOOK, USER_ID_HEADER, USER_ID_QUERY_PARAM
+from app.utils.progress_store import DEFAULT_USER
+
+# Longest identity accepted from a request
+MAX_USER_ID_LENGTH = 256
+
+_hook = None
+_hook_lock = threading.Lock()
+
+_current_user: contextvars.ContextVar = contextvars.ContextVar("current_user", default=None)
+
+
+@contextmanager
+def acting_as(user_id: str) -> Iterator[str]:
+    """
+    Run code (and the agent threads it starts) on behalf of a learner.
+
+    Args:
+        user_id: Learner identity
+
+    Yields:
+        The user id
+    """
+    token = _current_user.set(user_id)
+    try:
+        yield user_id
+    finally:
+        _current_user.reset(token)
+
+
+def get_user_id() -> str:
+    """
+    Get the identity of the learner in the current Streamlit session or agent call.
+
+    Returns:
+        User id, or DEFAULT_USER if no source provides one
+    """
+    user_id = _current_user.get()
+    if user_id:
+        return user_id
+
+    # A misconfigured hook should fail loudly rather than merge everyone's progress
+    _load_hook()
+
+    sources = [_from_hook]
+    # Outside a script run (e.g. in an agent thread) there is no request to read
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        sources += [_from_header, _from_query_param]
+
+    for source in sources:
+        user_id = source()
+        if user_id:
+            user_id = str(user_id).strip()[:MAX_USER_ID_LENGTH]
+            if user_id:
+                return user_id
+    return DEFAULT_USER
+
+
+def _from_hook() -> Optional[str]:
+    """Call the configured auth hook."""
+    hook = _load_hook()
+    return hook() if hook else None
+
+
+def _from_header() -> Optional[str]:
+    """Read the configured request header."""
+    if not USER_ID_HEADER:
+        return None
+    return st.context.headers.get(USER_ID_HEADER)
+
+
+def _from_query_param() -> Optional[str]:
+    """Read the configured query parameter."""
+    if not USER_ID_QUERY_PARAM:
+        return None
+    return st.query_params.get(USER_ID_QUERY_PARAM)
+
+
+def _load_hook() -> Optional[Callable[[], Optional[str]]]:
+    """Import the USER_ID_HOOK function once per process."""
+    global _hook
+    if not USER_ID_HOOK:
+        return None
+    if _hook is None:
+        with _hook_lock:
+            if _hook is None:
+                module_name, _, function_name = USER_ID_HOOK.partition(":")
+                if not function_name:
+                    raise ValueError(f"USER_ID_HOOK must look like 'module:function', got {USER_ID_HOOK!r}")
+                _hook = getattr(importlib.import_module(module_name), function_name)
+    return _hook
@@ -0,0 +1,85 @@
+"""Tests for progress storage and the progress repository."""
+
+import json
+
+from app.utils.progress_repository import ProgressRepository
+from app.utils.progress_store import DEFAULT_USER, JsonProgressStore, SQLiteProgressStore
+
+
+def make_repository(path) -> ProgressRepository:
+    return ProgressRepository(JsonProgressStore(str(path), flush_interval=0))
+
+
+def test_users_do_not_share_progress(tmp_path):
+    path = tmp_path / "progress.json"
+    repository = make_repository(path)
+
+    repository.mark_complete("alice", "study_guide", "domain1")
+    repository.mark_complete("bob", "labs", "lab1_1")
+
+    assert repository.get("alice").completed_sections("study_guide") == ["domain1"]
+    assert repository.get("alice").completed_sections("labs") == []
+    assert repository.get("bob").completed_sections("labs") == ["lab1_1"]
+    assert repository.get("bob").completed_sections("study_guide") == []
+
+    # A new process reading the file sees the same split
+    reloaded = make_repository(path)
+    assert reloaded.get("alice").completed_sections("study_guide") == ["domain1"]
+    assert reloaded.get("alice").completed_sections("labs") == []
+    assert reloaded.get("bob").completed_sections("labs") == ["lab1_1"]
+    assert reloaded.get(DEFAULT_USER).completion_percentage() == 0
+
+
+def test_reset_only_clears_one_user(tmp_path):
+    path = tmp_path / "progress.json"
+    repository = make_repository(path)
+    repository.mark_complete(DEFAULT_USER, "labs", "lab1_1")
+    repository.mark_complete("alice", "labs", "lab1_2")
+
+    repository.reset(DEFAULT_USER)
+
+    reloaded = make_repository(path)
+    assert reloaded.get(DEFAULT_USER).completed_sections("labs") == []
+    assert reloaded.get("alice").completed_sections("labs") == ["lab1_2"]
+
+
+def test_default_user_keeps_the_original_format(tmp_path):
+    path = tmp_path / "progress.json"
+    path.write_text(json.dumps({
+        "study_guide": {"intro": {"complete": True, "timestamp": "2024-01-01T00:00:00"}},
+        "labs": {},
+        "last_updated": "2024-01-01T00:00:00"
+    }))
+    repository = make_repository(path)
+
+    assert repository.get(DEFAULT_USER).completed_sections("study_guide") == ["intro"]
+    assert repository.get("alice").completed_sections("study_guide") == []
+
+    repository.mark_complete("alice", "labs", "lab1_1")
+    document = json.loads(path.read_text())
+    assert document["study_guide"] == {"intro": {"complete": True, "timestamp": "2024-01-01T00:00:00"}}
+    assert document["users"]["alice"]["labs"]["lab1_1"]["complete"] is True
+
+
+def test_changes_from_another_process_show_up_after_reload(tmp_path):
+    path = str(tmp_path / "progress.sqlite3")
+    # Two repositories on one database stand in for two worker processes
+    first = ProgressRepository(SQLiteProgressStore(path), reload_interval=0)
+    second = ProgressRepository(SQLiteProgressStore(path), reload_interval=0)
+    assert second.get("alice").completed_sections("labs") == []
+
+    first.mark_complete("alice", "labs", "lab1_1")
+
+    assert second.get("alice").completed_sections("labs") == ["lab1_1"]
+
+
+def test_models_are_served_from_memory_within_the_reload_interval(tmp_path):
+    path = str(tmp_path / "progress.sqlite3")
+    first = ProgressRepository(SQLiteProgressStore(path), reload_interval=0)
+    second = ProgressRepository(SQLiteProgressStore(path), reload_interval=3600)
+    model = second.get("alice")
+
+    first.mark_complete("alice", "labs", "lab1_1")
+
+    assert second.get("alice") is model
+    assert model.completed_sections("labs") == []
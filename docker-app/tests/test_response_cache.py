@@ -0,0 +1,57 @@
+"""Tests for the coordinator's answer cache."""
+
+import pytest
+
+from app.utils.response_cache import MemoryCacheBackend, ResponseCache
+
+DOMAINS = ["ingestion"]
+MODEL_ID = "model"
+
+
+def make_cache(similarity: float = 0.0) -> ResponseCache:
+    return ResponseCache(MemoryCacheBackend(), similarity=similarity)
+
+
+def test_normalized_question_hits():
+    cache = make_cache()
+    cache.put("Explain AWS Glue", DOMAINS, MODEL_ID, "answer")
+
+    assert cache.get("explain aws glue?", DOMAINS, MODEL_ID) == "answer"
+
+
+def test_near_duplicates_are_off_by_default():
+    cache = make_cache()
+    cache.put("Please explain AWS Glue crawlers", DOMAINS, MODEL_ID, "answer")
+
+    assert cache.get("Explain AWS Glue crawlers", DOMAINS, MODEL_ID) is None
+
+
+@pytest.mark.parametrize("similarity", [0.0, 0.5, 0.8])
+@pytest.mark.parametrize("cached, asked", [
+    ("How do I process Kinesis Data Streams with Lambda?",
+     "How do I process Kinesis Data Streams without Lambda?"),
+    ("Should I partition my S3 data lake by date?",
+     "Should I not partition my S3 data lake by date?"),
+    ("How do I tune Glue job performance for large datasets?",
+     "How do I tune EMR job performance for large datasets?"),
+])
+def test_single_word_changes_miss(similarity, cached, asked):
+    cache = make_cache(similarity)
+    cache.put(cached, DOMAINS, MODEL_ID, "answer")
+
+    assert cache.get(asked, DOMAINS, MODEL_ID) is None
+
+
+def test_filler_words_hit_when_enabled():
+    cache = make_cache(similarity=0.5)
+    cache.put("Explain AWS Glue crawlers", DOMAINS, MODEL_ID, "answer")
+
+    assert cache.get("Please explain AWS Glue crawlers", DOMAINS, MODEL_ID) == "answer"
+
+
+def test_context_is_part_of_the_key():
+    cache = make_cache()
+    cache.put("Explain AWS Glue", DOMAINS, MODEL_ID, "answer", context="A")
+
+    assert cache.get("Explain AWS Glue", DOMAINS, MODEL_ID, context="B") is None
+    assert cache.get("Explain AWS Glue", DOMAINS, MODEL_ID, context="A") == "answer"